@@ -0,0 +1,190 @@
+"""Arena: hundreds of AI snakes on one large board.
+
+    python arena.py --board 256x256 --bots 100 200 400 800 --ticks 500
+
+Arena is a World whose bots steer themselves every tick. Collisions go
+through the World's shared occupancy grid, so a move costs one lookup
+whatever the number or length of the other snakes; when heads meet, the
+longest snake survives. Bots find food through FoodIndex, a spatial hash of
+square blocks searched outwards from the head, so a bot's decision never
+looks at more than a few blocks. Tick cost grows with the number of snakes,
+not with the number of segments on the board.
+
+Run as a script it measures ms per tick and µs per snake for each bot count.
+"""
+import argparse
+import sys
+import time
+from engine import DIRECTIONS, OPPOSITE_DIRECTIONS
+from replay import DIRECTION_NAMES
+from world import World, parse_board
+
+BLOCK_CELLS = 8
+SEARCH_RINGS = 6
+WANDER_TURN_CHANCE = 0.1
+
+class FoodIndex:
+    """Food cells bucketed by BLOCK_CELLS x BLOCK_CELLS block, for nearest-food queries."""
+    
+    def __init__(self, cols, rows, block=BLOCK_CELLS):
+        self.cols = cols
+        self.block = block
+        self.block_cols = (cols + block - 1) // block
+        self.block_rows = (rows + block - 1) // block
+        self.buckets = [set() for _ in range(self.block_cols * self.block_rows)]
+    
+    def bucket_of(self, cell):
+        row, col = divmod(cell, self.cols)
+        return (row // self.block) * self.block_cols + col // self.block
+    
+    def add(self, cell):
+        self.buckets[self.bucket_of(cell)].add(cell)
+    
+    def remove(self, cell):
+        self.buckets[self.bucket_of(cell)].discard(cell)
+    
+    def nearest(self, cell, rings=SEARCH_RINGS):
+        """Closest food to ``cell`` by Manhattan distance, or None within ``rings`` blocks."""
+        cols = self.cols
+        block = self.block
+        row, col = divmod(cell, cols)
+        block_row = row // block
+        block_col = col // block
+        best = None
+        best_distance = None
+        for ring in range(rings + 1):
+            for bucket_row in range(max(0, block_row - ring), min(self.block_rows, block_row + ring + 1)):
+                on_edge = bucket_row in (block_row - ring, block_row + ring)
+                step = 1 if on_edge else 2 * ring
+                for bucket_col in range(block_col - ring, block_col + ring + 1, step or 1):
+                    if bucket_col < 0 or bucket_col >= self.block_cols:
+                        continue
+                    for food in self.buckets[bucket_row * self.block_cols + bucket_col]:
+                        food_row, food_col = divmod(food, cols)
+                        distance = abs(food_row - row) + abs(food_col - col)
+                        if best_distance is None or distance < best_distance:
+                            best = food
+                            best_distance = distance
+            # Everything in the next ring is more than ``ring * block`` cells away.
+            if best_distance is not None and best_distance <= ring * block:
+                break
+        return best
+
+class Arena(World):
+    def __init__(self, cols=256, rows=256, bots=200, food_count=None, respawn_ticks=20, seed=None):
+        self.food_index = FoodIndex(cols, rows)
+        super().__init__(cols, rows, max(16, bots) if food_count is None else food_count, respawn_ticks, seed)
+        self.bots = set()
+        for _ in range(bots):
+            self.add_bot()
+    
+    def add_bot(self):
+        snake = self.add_snake()
+        self.bots.add(snake.id)
+        return snake
+    
+    def remove_snake(self, snake_id):
+        super().remove_snake(snake_id)
+        self.bots.discard(snake_id)
+    
+    def place_food(self, cell, delta):
+        super().place_food(cell, delta)
+        self.food_index.add(cell)
+    
+    def eat_food(self, snake, cell, delta):
+        super().eat_food(snake, cell, delta)
+        self.food_index.remove(cell)
+    
+    def resolve_head_on(self, movers):
+        """The longest snake survives a head-on collision; on a tie nobody does."""
+        longest = max(len(mover.body) for mover in movers)
+        winners = [mover for mover in movers if len(mover.body) == longest]
+        return winners[0] if len(winners) == 1 else None
+    
+    def step(self):
+        heads = {snake.body.head() for snake in self.snakes.values() if snake.alive}
+        for snake_id in self.bots:
+            snake = self.snakes[snake_id]
+            if snake.alive:
+                self.steer(snake, heads)
+        return super().step()
+    
+    def steer(self, snake, heads):
+        """Turn toward the nearest food, avoiding dead ends and cells next to other heads."""
+        cols = self.cols
+        rows = self.rows
+        counts = self.grid.counts
+        head = snake.body.head()
+        row, col = divmod(head, cols)
+        target = self.food_index.nearest(head)
+        if target is not None:
+            target_row, target_col = divmod(target, cols)
+        wander = target is None and self.rng.random() < WANDER_TURN_CHANCE
+        
+        best = None
+        best_key = None
+        reverse = OPPOSITE_DIRECTIONS[snake.direction]
+        for direction in DIRECTION_NAMES:
+            if direction == reverse:
+                continue
+            dx, dy = DIRECTIONS[direction]
+            next_col = col + dx
+            next_row = row + dy
+            if next_col < 0 or next_col >= cols or next_row < 0 or next_row >= rows:
+                continue
+            cell = next_row * cols + next_col
+            if counts[cell]:
+                continue
+            
+            exits = 0
+            risky = False
+            for other_dx, other_dy in DIRECTIONS.values():
+                other_col = next_col + other_dx
+                other_row = next_row + other_dy
+                if 0 <= other_col < cols and 0 <= other_row < rows:
+                    other = other_row * cols + other_col
+                    if not counts[other]:
+                        exits += 1
+                    elif other != head and other in heads:
+                        risky = True
+            if target is not None:
+                distance = abs(target_row - next_row) + abs(target_col - next_col)
+            elif wander:
+                distance = direction == snake.direction
+            else:
+                distance = direction != snake.direction
+            key = (exits == 0, risky, distance, -exits)
+            if best_key is None or key < best_key:
+                best = direction
+                best_key = key
+        if best is not None:
+            snake.direction = best
+
+def measure(cols, rows, bots, ticks, seed=0):
+    """(ms per tick, snakes alive on average, segments on the board at the end) for ``ticks`` ticks."""
+    arena = Arena(cols, rows, bots, seed=seed)
+    alive = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        arena.step()
+        alive += sum(snake.alive for snake in arena.snakes.values())
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000 / ticks, alive / ticks, arena.grid.size - arena.grid.free_count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run AI snakes in an arena and measure tick cost")
+    parser.add_argument("--board", type=parse_board, default=(256, 256), help="COLSxROWS")
+    parser.add_argument("--bots", type=int, nargs="+", default=[100, 200, 400, 800])
+    parser.add_argument("--ticks", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    
+    cols, rows = args.board
+    print(f"{'bots':>6} {'ms/tick':>9} {'us/snake':>9} {'alive':>7} {'segments':>9}")
+    for bots in args.bots:
+        tick_ms, alive, segments = measure(cols, rows, bots, args.ticks, args.seed)
+        print(f"{bots:>6} {tick_ms:>9.2f} {tick_ms * 1000 / max(alive, 1):>9.1f} {alive:>7.0f} {segments:>9}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""Sprite loading with an in-process cache and an on-disk cache of resized images.
+
+Resized sprites are stored under .sprite_cache, named after a hash of the
+source file's name, size and modification time plus the target size, so an
+edited source image or a new unit size simply misses the cache. PhotoImages
+are kept per Tk root, so every game after the first one reuses them without
+decoding anything.
+
+Decoding, resizing and background composition only use PIL and may run on a
+preloading thread; a lock makes a game that starts early wait for a sprite
+that is being decoded rather than decode it a second time. Only the
+PhotoImage conversion has to happen on the Tk thread.
+"""
+import hashlib
+import os
+import threading
+from PIL import Image, ImageTk
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(ASSET_DIR, ".sprite_cache")
+
+_sprites = {}
+_backgrounds = {}
+_photos = {}
+_lock = threading.RLock()
+
+def cache_key(path, size):
+    stat = os.stat(path)
+    source = f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}:{size[0]}x{size[1]}"
+    return hashlib.sha1(source.encode()).hexdigest()
+
+def load_sprite(name, size):
+    key = (name, size)
+    sprite = _sprites.get(key)
+    if sprite is not None:
+        return sprite
+    with _lock:
+        if key not in _sprites:
+            _sprites[key] = decode_sprite(name, size)
+        return _sprites[key]
+
+def decode_sprite(name, size):
+    path = os.path.join(ASSET_DIR, name)
+    cached_path = os.path.join(CACHE_DIR, cache_key(path, size) + ".png")
+    
+    if os.path.exists(cached_path):
+        sprite = Image.open(cached_path)
+        sprite.load()
+    else:
+        sprite = Image.open(path).resize(size, Image.Resampling.LANCZOS)
+        save_cached(sprite, cached_path)
+    return sprite
+
+def save_cached(image, cached_path):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temp_path = f"{cached_path}.{os.getpid()}.tmp"
+        image.save(temp_path, "PNG")
+        os.replace(temp_path, cached_path)
+    except OSError as e:
+        print(f"Could not cache sprite {cached_path}: {e}")
+
+def compose_background(tile, board_width, board_height, unit_size):
+    """Tile the grass sprite over the whole board once, as a single image."""
+    if tile.size != (unit_size, unit_size):
+        tile = tile.resize((unit_size, unit_size), Image.Resampling.LANCZOS)
+    background = Image.new(tile.mode, (board_width, board_height))
+    for x in range(0, board_width, unit_size):
+        for y in range(0, board_height, unit_size):
+            background.paste(tile, (x, y))
+    return background
+
+def load_photo(master, name, size):
+    key = ("sprite", name, size)
+    return cached_photo(master, key, lambda: load_sprite(name, size))
+
+def background_image(name, board_width, board_height, unit_size):
+    key = (name, board_width, board_height, unit_size)
+    background = _backgrounds.get(key)
+    if background is not None:
+        return background
+    with _lock:
+        if key not in _backgrounds:
+            tile = load_sprite(name, (unit_size, unit_size))
+            _backgrounds[key] = compose_background(tile, board_width, board_height, unit_size)
+        return _backgrounds[key]
+
+def load_background(master, name, board_width, board_height, unit_size):
+    key = ("background", name, board_width, board_height, unit_size)
+    return cached_photo(master, key, lambda: background_image(name, board_width, board_height, unit_size))
+
+def cached_photo(master, key, build):
+    entry = _photos.get(key)
+    if entry is not None and entry[0] is master:
+        return entry[1]
+    photo = ImageTk.PhotoImage(build(), master=master)
+    _photos[key] = (master, photo)
+    return photo
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""Vectorized simulation of many independent games.
+
+BatchEngine keeps N games as NumPy arrays (occupancy counts, free-cell
+permutations, body ring buffers, food, golden apple and timers) and advances
+all of them with one call to step(). It follows SnakeEngine's rules operation
+for operation, including the free-cell index layout and the order of random
+draws, so with the same per-game ``random.Random`` instances and the same
+directions every game is bit-identical to a SnakeEngine that is reset as soon
+as it dies. Random draws are the only per-game Python work; they happen for
+the few games that eat or are waiting for a golden apple on a given tick.
+
+Requires NumPy.
+"""
+import random
+import numpy as np
+from engine import DIRECTIONS
+
+DIRECTION_NAMES = ("up", "down", "left", "right")
+DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTION_NAMES)}
+DIRECTION_DX = np.array([DIRECTIONS[name][0] for name in DIRECTION_NAMES], dtype=np.int32)
+DIRECTION_DY = np.array([DIRECTIONS[name][1] for name in DIRECTION_NAMES], dtype=np.int32)
+KEEP_DIRECTION = -1
+
+class BatchEngine:
+    def __init__(self, games, board_width=600, board_height=600, unit_size=25, seeds=None, rngs=None):
+        self.games = games
+        self.board_width = board_width
+        self.board_height = board_height
+        self.unit_size = unit_size
+        self.cols = board_width // unit_size
+        self.rows = board_height // unit_size
+        self.size = self.cols * self.rows
+        self.capacity = self.size + 2
+        self.start_cell = (100 // unit_size) * self.cols + 100 // unit_size
+        
+        if rngs is None:
+            seeds = range(games) if seeds is None else seeds
+            rngs = [random.Random(seed) for seed in seeds]
+        self.rngs = list(rngs)
+        
+        self.counts = np.zeros((games, self.size), dtype=np.uint8)
+        self.free = np.zeros((games, self.size), dtype=np.int32)
+        self.free_slot = np.zeros((games, self.size), dtype=np.int32)
+        self.free_count = np.zeros(games, dtype=np.int32)
+        self.body = np.zeros((games, self.capacity), dtype=np.int32)
+        self.start = np.zeros(games, dtype=np.int32)
+        self.length = np.zeros(games, dtype=np.int32)
+        
+        self.direction = np.zeros(games, dtype=np.int8)
+        self.score = np.zeros(games, dtype=np.int32)
+        self.level = np.zeros(games, dtype=np.int32)
+        self.game_speed = np.zeros(games, dtype=np.int32)
+        self.food = np.zeros(games, dtype=np.int32)
+        self.golden = np.zeros(games, dtype=np.int32)
+        self.golden_timer = np.zeros(games, dtype=np.int32)
+        self.rainbow = np.zeros(games, dtype=bool)
+        self.rainbow_timer = np.zeros(games, dtype=np.int32)
+        self.ticks = np.zeros(games, dtype=np.int64)
+        
+        self.games_finished = np.zeros(games, dtype=np.int64)
+        self.final_score = np.zeros(games, dtype=np.int32)
+        self.final_length = np.zeros(games, dtype=np.int32)
+        self.final_ticks = np.zeros(games, dtype=np.int64)
+        
+        self.reset_games(np.arange(games))
+    
+    def reset_games(self, games):
+        if len(games) == 0:
+            return
+        self.counts[games] = 0
+        self.free[games] = np.arange(self.size, dtype=np.int32)
+        self.free_slot[games] = np.arange(self.size, dtype=np.int32)
+        self.free_count[games] = self.size
+        
+        self.start[games] = self.capacity - 1
+        self.length[games] = 1
+        cells = np.full(len(games), self.start_cell, dtype=np.int32)
+        self.body[games, self.capacity - 1] = cells
+        self.add_cells(games, cells)
+        
+        self.direction[games] = DIRECTION_CODES["right"]
+        self.score[games] = 0
+        self.level[games] = 1
+        self.game_speed[games] = 120
+        self.golden[games] = -1
+        self.golden_timer[games] = 0
+        self.rainbow[games] = False
+        self.rainbow_timer[games] = 0
+        self.ticks[games] = 0
+        
+        for game in games.tolist():
+            self.food[game] = self.random_free(game, -1)
+    
+    def random_free(self, game, exclude):
+        free_count = int(self.free_count[game])
+        free = self.free[game]
+        if free_count == 0 or (free_count == 1 and free[0] == exclude):
+            return -1
+        randrange = self.rngs[game].randrange
+        while True:
+            cell = int(free[randrange(free_count)])
+            if cell != exclude:
+                return cell
+    
+    def swap_free(self, games, cells, slots):
+        others = self.free[games, slots]
+        old_slots = self.free_slot[games, cells]
+        self.free[games, slots] = cells
+        self.free_slot[games, cells] = slots
+        self.free[games, old_slots] = others
+        self.free_slot[games, others] = old_slots
+    
+    def add_cells(self, games, cells):
+        counts = self.counts[games, cells]
+        newly = counts == 0
+        if newly.any():
+            new_games = games[newly]
+            self.swap_free(new_games, cells[newly], self.free_count[new_games] - 1)
+            self.free_count[new_games] -= 1
+        self.counts[games, cells] = counts + 1
+    
+    def remove_cells(self, games, cells):
+        counts = self.counts[games, cells] - 1
+        self.counts[games, cells] = counts
+        emptied = counts == 0
+        if emptied.any():
+            empty_games = games[emptied]
+            self.swap_free(empty_games, cells[emptied], self.free_count[empty_games])
+            self.free_count[empty_games] += 1
+    
+    def grow_tails(self, games):
+        tails = self.body[games, (self.start[games] + self.length[games] - 1) % self.capacity]
+        self.body[games, (self.start[games] + self.length[games]) % self.capacity] = tails
+        self.length[games] += 1
+        self.add_cells(games, tails)
+    
+    def update_level(self, games):
+        levels = self.score[games] // 50 + 1
+        games = games[levels > self.level[games]]
+        self.level[games] = self.score[games] // 50 + 1
+        self.game_speed[games] = np.maximum(80, 120 - self.level[games] * 5)
+    
+    def step(self, directions=None):
+        """Advance every game one tick.
+
+        ``directions`` holds a direction code per game (KEEP_DIRECTION keeps the
+        current one). Games that die are recorded in the final_* arrays and
+        reset in place. Returns (eaten, died): eaten is 0, 1 for food or 2 for a
+        golden apple.
+        """
+        if directions is not None:
+            directions = np.asarray(directions, dtype=np.int8)
+            turn = (directions != KEEP_DIRECTION) & (directions != (self.direction ^ 1))
+            self.direction[turn] = directions[turn]
+        
+        heads = self.body[np.arange(self.games), self.start]
+        rows, cols = np.divmod(heads, self.cols)
+        cols = cols + DIRECTION_DX[self.direction]
+        rows = rows + DIRECTION_DY[self.direction]
+        outside = (cols < 0) | (cols >= self.cols) | (rows < 0) | (rows >= self.rows)
+        cells = np.where(outside, 0, rows * self.cols + cols).astype(np.int32)
+        died = outside | (self.counts[np.arange(self.games), cells] != 0)
+        
+        moving = np.flatnonzero(~died)
+        cells = cells[moving]
+        self.start[moving] = (self.start[moving] - 1) % self.capacity
+        self.body[moving, self.start[moving]] = cells
+        self.length[moving] += 1
+        self.add_cells(moving, cells)
+        
+        eaten = np.zeros(self.games, dtype=np.int8)
+        ate_food = cells == self.food[moving]
+        ate_golden = ~ate_food & (cells == self.golden[moving])
+        
+        food_games = moving[ate_food]
+        if len(food_games):
+            eaten[food_games] = 1
+            self.score[food_games] += 10
+            self.update_level(food_games)
+            for game in food_games.tolist():
+                self.food[game] = self.random_free(game, int(self.golden[game]))
+        
+        golden_games = moving[ate_golden]
+        if len(golden_games):
+            eaten[golden_games] = 2
+            self.score[golden_games] += 50
+            self.update_level(golden_games)
+            self.rainbow[golden_games] = True
+            self.rainbow_timer[golden_games] = 0
+            self.golden[golden_games] = -1
+            self.golden_timer[golden_games] = 0
+            self.grow_tails(golden_games)
+            self.grow_tails(golden_games)
+        
+        plain_games = moving[~(ate_food | ate_golden)]
+        if len(plain_games):
+            self.length[plain_games] -= 1
+            tails = self.body[plain_games, (self.start[plain_games] + self.length[plain_games]) % self.capacity]
+            self.remove_cells(plain_games, tails)
+        
+        self.update_golden_apple_spawn(moving)
+        self.update_rainbow(moving)
+        self.ticks[moving] += 1
+        
+        dead_games = np.flatnonzero(died)
+        if len(dead_games):
+            self.games_finished[dead_games] += 1
+            self.final_score[dead_games] = self.score[dead_games]
+            self.final_length[dead_games] = self.length[dead_games]
+            self.final_ticks[dead_games] = self.ticks[dead_games]
+            self.reset_games(dead_games)
+        
+        return eaten, died
+    
+    def update_golden_apple_spawn(self, games):
+        self.golden_timer[games] += 1
+        timers = self.golden_timer[games]
+        has_golden = self.golden[games] != -1
+        
+        waiting = games[~has_golden & (timers > 100)]
+        for game in waiting.tolist():
+            if self.rngs[game].random() < 0.005:
+                self.golden[game] = self.random_free(game, int(self.food[game]))
+                self.golden_timer[game] = 0
+        
+        expired = games[has_golden & (timers > 250)]
+        self.golden[expired] = -1
+        self.golden_timer[expired] = 0
+    
+    def update_rainbow(self, games):
+        active = games[self.rainbow[games]]
+        self.rainbow_timer[active] += 1
+        ended = active[self.rainbow_timer[active] > 300]
+        self.rainbow[ended] = False
+        self.rainbow_timer[ended] = 0
+    
+    def body_cells(self, game):
+        """Body of one game as a list of cells, head first."""
+        indexes = (self.start[game] + np.arange(self.length[game])) % self.capacity
+        return self.body[game, indexes].tolist()
\ No newline at end of file
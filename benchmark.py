@@ -0,0 +1,333 @@
+"""Headless benchmarks for the game's hot paths.
+
+    python benchmark.py                      # run everything, write benchmark_results.json
+    python benchmark.py --quick              # fewer iterations, smaller boards
+    python benchmark.py --compare old.json   # also report changes against a previous run
+
+Every result records its unit and whether higher or lower is better, so two
+result files can be compared directly. Rendering is measured on a real Tk
+canvas when a display is available and on a no-op canvas otherwise (which
+then only measures the Python side of the renderer); the offscreen PIL
+renderer is always measured when Pillow is installed.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from engine import SnakeEngine
+from grid import cycle_directions, hamiltonian_cycle
+from particles import ParticleSystem
+
+BOARDS = [(24, 24, 25), (48, 48, 25), (96, 96, 10)]
+QUICK_BOARDS = [(24, 24, 25), (48, 48, 25)]
+FILL_LEVELS = (0.0, 0.5, 0.9, 0.99)
+REGRESSION_THRESHOLD = 10.0
+
+class NullCanvas:
+    def __init__(self):
+        self.next_item = 0
+    
+    def create_item(self, *args, **kwargs):
+        self.next_item += 1
+        return self.next_item
+    
+    create_oval = create_rectangle = create_line = create_image = create_text = create_item
+    
+    def noop(self, *args, **kwargs):
+        pass
+    
+    delete = coords = itemconfig = tag_lower = tag_raise = noop
+
+def board_name(cols, rows):
+    return f"{cols}x{rows}"
+
+def snake_on_cycle(cols, rows, unit, length):
+    """Engine with a snake of ``length`` laid along a Hamiltonian cycle, and the cycle's directions."""
+    engine = SnakeEngine(cols * unit, rows * unit, unit, rng=random.Random(0))
+    cycle = hamiltonian_cycle(cols, rows)
+    directions = cycle_directions(cols, cycle)
+    body = [cycle[index] for index in range(length - 1, -1, -1)]
+    engine.place_snake(body, directions[cycle[length - 2]] if length > 1 else directions[cycle[-1]])
+    engine.food_cell = None
+    engine.golden_apple_timer = -10 ** 9
+    return engine, directions
+
+def best_of(repeats, run):
+    return min(run() for _ in range(repeats))
+
+def bench_ticks(results, cols, rows, unit, ticks, repeats):
+    size = cols * rows
+    for length in sorted({1, size // 4, size // 2, 3 * size // 4, size - 1}):
+        engine, directions = snake_on_cycle(cols, rows, unit, length)
+        
+        def run():
+            step = engine.step
+            body = engine.body
+            start = time.perf_counter()
+            for _ in range(ticks):
+                step(directions[body.head()])
+            return time.perf_counter() - start
+        
+        elapsed = best_of(repeats, run)
+        assert engine.alive
+        results[f"engine.ticks_per_sec[{board_name(cols, rows)},len={length}]"] = {
+            "value": ticks / elapsed, "unit": "ticks/s", "better": "higher"
+        }
+
+def bench_create_food(results, cols, rows, unit, calls, repeats):
+    size = cols * rows
+    for fill in FILL_LEVELS + (None,):
+        length = size - 2 if fill is None else max(1, int(size * fill))
+        engine, _ = snake_on_cycle(cols, rows, unit, length)
+        
+        def run():
+            create_food = engine.create_food
+            start = time.perf_counter()
+            for _ in range(calls):
+                create_food()
+            return time.perf_counter() - start
+        
+        elapsed = best_of(repeats, run)
+        label = "full" if fill is None else f"{fill:.2f}"
+        results[f"engine.create_food_us[{board_name(cols, rows)},fill={label}]"] = {
+            "value": elapsed / calls * 1e6, "unit": "us/call", "better": "lower"
+        }
+
+def bench_batch(results, games, ticks):
+    try:
+        from batch import BatchEngine, DIRECTION_NAMES
+    except ImportError as e:
+        print(f"Skipping batch benchmarks: {e}")
+        return
+    import numpy as np
+    
+    engine = BatchEngine(games, seeds=range(games))
+    directions = np.random.default_rng(0).integers(-1, len(DIRECTION_NAMES), (ticks, games)).astype(np.int8)
+    start = time.perf_counter()
+    for tick in range(ticks):
+        engine.step(directions[tick])
+    elapsed = time.perf_counter() - start
+    results[f"batch.game_ticks_per_sec[games={games}]"] = {
+        "value": games * ticks / elapsed, "unit": "ticks/s", "better": "higher"
+    }
+
+def bench_arena(results, cols, rows, bots, ticks):
+    from arena import measure
+    
+    tick_ms, alive, _ = measure(cols, rows, bots, ticks)
+    results[f"arena.us_per_snake_tick[{board_name(cols, rows)},bots={bots}]"] = {
+        "value": tick_ms * 1000 / max(alive, 1), "unit": "us", "better": "lower"
+    }
+
+def make_canvas():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        return tk.Canvas(root, width=600, height=600), "tk"
+    except Exception:
+        return NullCanvas(), "null"
+
+def bench_render(results, canvas, canvas_kind, cols, rows, unit, frames):
+    from renderer import CanvasRenderer
+    
+    size = cols * rows
+    for length in sorted({1, size // 4, size - 1}):
+        engine, directions = snake_on_cycle(cols, rows, unit, length)
+        particles = ParticleSystem(rng=random.Random(0))
+        renderer = CanvasRenderer(canvas, engine)
+        
+        start = time.perf_counter()
+        for frame in range(frames):
+            engine.step(directions[engine.body.head()])
+            if frame % 10 == 0:
+                particles.emit(100, 100, 16, speed=5, life=25, colors=range(5))
+            particles.update()
+            renderer.draw_particles(particles)
+            renderer.draw_snake()
+        elapsed = time.perf_counter() - start
+        
+        results[f"render.frame_ms[{canvas_kind},{board_name(cols, rows)},len={length}]"] = {
+            "value": elapsed / frames * 1000, "unit": "ms/frame", "better": "lower"
+        }
+        canvas.delete("all")
+
+def bench_viewport_render(results, cols, rows, unit, frames):
+    """Frame time on a large world seen through a 600x600 viewport."""
+    from viewport import ViewportRenderer
+    
+    for length in (1, 5000):
+        engine, directions = snake_on_cycle(cols, rows, unit, length)
+        particles = ParticleSystem(rng=random.Random(0))
+        renderer = ViewportRenderer(NullCanvas(), engine, 600, 600, grass_photo="grass")
+        
+        start = time.perf_counter()
+        for frame in range(frames):
+            engine.step(directions[engine.body.head()])
+            if frame % 10 == 0:
+                x, y = engine.head_position
+                particles.emit(x, y, 16, speed=5, life=25, colors=range(5))
+            particles.update()
+            renderer.render(particles)
+        elapsed = time.perf_counter() - start
+        
+        results[f"render.frame_ms[viewport,{board_name(cols, rows)},len={length}]"] = {
+            "value": elapsed / frames * 1000, "unit": "ms/frame", "better": "lower"
+        }
+
+def bench_offscreen_render(results, cols, rows, unit, frames):
+    try:
+        from offscreen import FrameRenderer
+    except ImportError as e:
+        print(f"Skipping offscreen render benchmarks: {e}")
+        return
+    
+    size = cols * rows
+    for length in sorted({1, size // 4, size - 1}):
+        engine, directions = snake_on_cycle(cols, rows, unit, length)
+        particles = ParticleSystem(rng=random.Random(0))
+        renderer = FrameRenderer.from_assets(engine)
+        
+        start = time.perf_counter()
+        for frame in range(frames):
+            engine.step(directions[engine.body.head()])
+            if frame % 10 == 0:
+                particles.emit(100, 100, 16, speed=5, life=25, colors=range(5))
+            particles.update()
+            renderer.render(particles)
+        elapsed = time.perf_counter() - start
+        
+        results[f"render.frame_ms[offscreen,{board_name(cols, rows)},len={length}]"] = {
+            "value": elapsed / frames * 1000, "unit": "ms/frame", "better": "lower"
+        }
+
+def bench_load_images(results, unit, repeats):
+    try:
+        import assets
+    except ImportError as e:
+        print(f"Skipping image benchmarks: {e}")
+        return
+    
+    names = ("grass.png", "apple.png", "golden_apple.png")
+    size = (unit, unit)
+    original_cache_dir = assets.CACHE_DIR
+    
+    def load_all():
+        start = time.perf_counter()
+        for name in names:
+            assets.load_sprite(name, size)
+        return time.perf_counter() - start
+    
+    def cold():
+        with tempfile.TemporaryDirectory() as cache_dir:
+            assets.CACHE_DIR = cache_dir
+            assets._sprites.clear()
+            return load_all()
+    
+    def disk():
+        assets._sprites.clear()
+        return load_all()
+    
+    try:
+        cold_time = best_of(repeats, cold)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            assets.CACHE_DIR = cache_dir
+            assets._sprites.clear()
+            load_all()
+            disk_time = best_of(repeats, disk)
+            memory_time = best_of(repeats, load_all)
+    finally:
+        assets.CACHE_DIR = original_cache_dir
+        assets._sprites.clear()
+    
+    for label, elapsed in (("cold", cold_time), ("disk_cache", disk_time), ("memory_cache", memory_time)):
+        results[f"assets.load_images_ms[{label}]"] = {
+            "value": elapsed * 1000, "unit": "ms", "better": "lower"
+        }
+
+def run_benchmarks(quick=False):
+    boards = QUICK_BOARDS if quick else BOARDS
+    repeats = 1 if quick else 3
+    ticks = 20000 if quick else 100000
+    results = {}
+    
+    for cols, rows, unit in boards:
+        print(f"Board {board_name(cols, rows)}...")
+        bench_ticks(results, cols, rows, unit, ticks, repeats)
+        bench_create_food(results, cols, rows, unit, 2000 if quick else 20000, repeats)
+    
+    bench_batch(results, 1000, 100 if quick else 500)
+    for bots in (100, 400):
+        bench_arena(results, 256, 256, bots, 100 if quick else 500)
+    
+    canvas, canvas_kind = make_canvas()
+    for cols, rows, unit in boards[:2]:
+        bench_render(results, canvas, canvas_kind, cols, rows, unit, 200 if quick else 1000)
+        bench_offscreen_render(results, cols, rows, unit, 100 if quick else 500)
+    
+    bench_viewport_render(results, 1000, 1000, 25, 200 if quick else 1000)
+    
+    bench_load_images(results, 25, repeats)
+    
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "quick": quick,
+            "canvas": canvas_kind
+        },
+        "results": results
+    }
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """Print per-metric changes; returns the names of metrics that regressed beyond ``threshold`` %."""
+    regressions = []
+    print(f"{'metric':<60}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None or not previous["value"]:
+            continue
+        change = (result["value"] - previous["value"]) / previous["value"] * 100
+        if result["better"] == "lower":
+            change = -change
+        flag = ""
+        if change < -threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<60}{previous['value']:>12.3f}{result['value']:>12.3f}{change:>+8.1f}%{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Snake Game benchmarks")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations and boards")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write results")
+    parser.add_argument("--compare", metavar="BASELINE", help="previous results file to compare with")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="percent slowdown reported as a regression")
+    args = parser.parse_args(argv)
+    
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    
+    current = run_benchmarks(quick=args.quick)
+    
+    with open(args.output, "w") as f:
+        json.dump(current, f, indent=1)
+    print(f"Wrote {len(current['results'])} results to {os.path.abspath(args.output)}")
+    
+    if baseline is not None:
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0f}%")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,269 @@
+"""Thin Tk client for server.py.
+
+    python client.py --host 127.0.0.1 --port 5555
+
+The client sends a direction code when an arrow or WASD key is pressed and
+otherwise only draws. A network thread splits the stream into messages,
+and the Tk thread applies them to a BoardState every few milliseconds.
+Every snake on the board is drawn by its own CanvasRenderer, the one the
+single-player game uses, looking at the snake through a SnakeView. Each
+renderer keeps its items under its own canvas tag, and a delta only
+re-renders the snakes that moved, which costs a few item updates per snake.
+The shared board has no golden apples, so the renderers never show one.
+"""
+import argparse
+import queue
+import socket
+import sys
+import threading
+import tkinter as tk
+import assets
+from engine import LEVEL_COLORS
+from protocol import DELTA, SNAPSHOT, WELCOME, BoardState, FrameDecoder, decode_delta, decode_welcome
+from renderer import CanvasRenderer
+from replay import DIRECTION_CODES
+from scheduler import Scheduler
+
+MAX_BOARD_PIXELS = 800
+KEYS = {
+    "w": "up", "up": "up",
+    "s": "down", "down": "down",
+    "a": "left", "left": "left",
+    "d": "right", "right": "right"
+}
+
+class Connection:
+    def __init__(self, host, port):
+        self.socket = socket.create_connection((host, port))
+        self.messages = queue.Queue()
+        self.received = 0
+        self.thread = threading.Thread(target=self.receive, name="snake-client", daemon=True)
+        self.thread.start()
+    
+    def receive(self):
+        decoder = FrameDecoder()
+        try:
+            while True:
+                data = self.socket.recv(65536)
+                if not data:
+                    break
+                self.received += len(data)
+                for payload in decoder.feed(data):
+                    self.messages.put(payload)
+        except OSError as e:
+            print(f"Error reading from server: {e}")
+        self.messages.put(None)
+    
+    def send_turn(self, direction):
+        try:
+            self.socket.sendall(bytes([DIRECTION_CODES[direction]]))
+        except OSError as e:
+            print(f"Error sending turn: {e}")
+    
+    def close(self):
+        try:
+            self.socket.close()
+        except OSError:
+            pass
+
+class SnakeView:
+    """A RemoteSnake with the engine attributes CanvasRenderer reads; ``ticks`` counts its moves."""
+    
+    food_cell = None
+    golden_apple_cell = None
+    rainbow_effect = False
+    rainbow_timer = 0
+    
+    def __init__(self, snake, cols, unit_size, color):
+        self.snake = snake
+        self.body = snake.body
+        self.cols = cols
+        self.unit_size = unit_size
+        self.snake_color = color
+        self.ticks = 0
+    
+    @property
+    def direction(self):
+        return self.snake.direction
+    
+    def position_of(self, cell):
+        row, col = divmod(cell, self.cols)
+        return col * self.unit_size, row * self.unit_size
+
+class MultiplayerClient:
+    def __init__(self, root, host, port):
+        self.root = root
+        self.root.title("Snake Game - multiplayer")
+        self.root.configure(bg="black")
+        self.connection = Connection(host, port)
+        self.board = None
+        self.snake_id = None
+        self.canvas = None
+        self.renderers = {}
+        self.food_items = {}
+        
+        self.status = tk.Label(root, text="Connecting...", font=("Courier", 14, "bold"), fg="#00FF00", bg="black")
+        self.status.pack(side="bottom", fill="x")
+        self.scheduler = Scheduler(self.status, "client")
+        self.scheduler.every(15, self.poll)
+        self.scheduler.every(1000, self.update_status)
+        self.root.bind("<KeyPress>", self.on_key)
+        self.root.protocol("WM_DELETE_WINDOW", self.quit)
+    
+    def quit(self):
+        self.connection.close()
+        self.root.destroy()
+    
+    def on_key(self, event):
+        key = event.keysym.lower()
+        if key == "escape":
+            self.quit()
+            return
+        direction = KEYS.get(key)
+        if direction is None or self.board is None:
+            return
+        snake = self.board.snakes.get(self.snake_id)
+        if snake is not None and direction != snake.direction:
+            self.connection.send_turn(direction)
+    
+    def poll(self):
+        messages = self.connection.messages
+        while True:
+            try:
+                payload = messages.get_nowait()
+            except queue.Empty:
+                return
+            if payload is None:
+                self.status.config(text="Disconnected", fg="#FF4444")
+                self.scheduler.close()
+                return
+            kind = payload[0]
+            if kind == WELCOME:
+                self.on_welcome(payload)
+            elif kind == SNAPSHOT:
+                self.board.apply_snapshot(payload)
+                self.redraw()
+            elif kind == DELTA:
+                self.on_delta(decode_delta(payload))
+    
+    def on_welcome(self, payload):
+        self.snake_id, cols, rows, self.tick_ms = decode_welcome(payload)
+        self.board = BoardState(cols, rows)
+        self.unit = max(4, min(25, MAX_BOARD_PIXELS // max(cols, rows)))
+        width = cols * self.unit
+        height = rows * self.unit
+        self.canvas = tk.Canvas(
+            self.root, bg="#1a1a1a", width=width, height=height,
+            highlightthickness=3, highlightbackground="#FFD700"
+        )
+        self.canvas.pack(side="top")
+        try:
+            background = assets.load_background(self.root, "grass.png", width, height, self.unit)
+            self.canvas.create_image(0, 0, image=background, anchor="nw", tags="background")
+            self.apple_photo = assets.load_photo(self.root, "apple.png", (self.unit, self.unit))
+        except Exception as e:
+            print(f"Error loading images: {e}")
+            self.apple_photo = None
+    
+    def color_of(self, snake_id):
+        if snake_id == self.snake_id:
+            return LEVEL_COLORS[0]
+        return LEVEL_COLORS[1 + snake_id % (len(LEVEL_COLORS) - 1)]
+    
+    def add_renderer(self, snake):
+        view = SnakeView(snake, self.board.cols, self.unit, self.color_of(snake.id))
+        self.renderers[snake.id] = CanvasRenderer(self.canvas, view, tag=f"snake{snake.id}")
+    
+    def drop_renderer(self, snake_id):
+        renderer = self.renderers.pop(snake_id, None)
+        if renderer is not None:
+            self.canvas.delete(renderer.tag)
+    
+    def place_food(self, cell):
+        # Drawn like the game's food: the apple sprite in a gold ring, under the snakes.
+        row, col = divmod(cell, self.board.cols)
+        x = col * self.unit
+        y = row * self.unit
+        size = self.unit
+        ring = self.canvas.create_oval(x - 2, y - 2, x + size + 2, y + size + 2, outline="#FFD700", width=2, tags="food")
+        if self.apple_photo is not None:
+            sprite = self.canvas.create_image(x, y, image=self.apple_photo, anchor="nw", tags="food")
+        else:
+            sprite = self.canvas.create_rectangle(
+                x, y, x + size, y + size, fill="#ff3333", outline="#cc0000", width=2, tags="food"
+            )
+        for item in (sprite, ring):
+            if self.canvas.find_withtag("background"):
+                self.canvas.tag_raise(item, "background")
+            else:
+                self.canvas.tag_lower(item)
+        self.food_items[cell] = (ring, sprite)
+    
+    def redraw(self):
+        for snake_id in list(self.renderers):
+            self.drop_renderer(snake_id)
+        self.canvas.delete("food")
+        self.food_items.clear()
+        for snake in self.board.snakes.values():
+            self.add_renderer(snake)
+        for cell in self.board.food:
+            self.place_food(cell)
+        self.update_status()
+    
+    def on_delta(self, delta):
+        canvas = self.canvas
+        board = self.board
+        board.apply_delta(delta)
+        for snake_id in delta.left:
+            self.drop_renderer(snake_id)
+        created = set()
+        for snake_id, _, _ in delta.spawned:
+            self.drop_renderer(snake_id)
+            if snake_id in board.snakes:
+                self.add_renderer(board.snakes[snake_id])
+                created.add(snake_id)
+        for snake_id, _, _ in delta.moves:
+            renderer = self.renderers.get(snake_id)
+            if renderer is not None and snake_id not in created:
+                renderer.engine.ticks += 1
+                renderer.render()
+        for snake_id in delta.died:
+            self.drop_renderer(snake_id)
+        
+        for cell in delta.food_removed:
+            items = self.food_items.pop(cell, None)
+            if items is not None:
+                canvas.delete(*items)
+        for cell in delta.food_added:
+            self.place_food(cell)
+        
+        if self.snake_id in delta.died or any(
+            move[0] == self.snake_id and move[2] for move in delta.moves
+        ):
+            self.update_status()
+    
+    def update_status(self):
+        if self.board is None:
+            return
+        snake = self.board.snakes.get(self.snake_id)
+        state = f"Score: {snake.score}  Length: {len(snake.body)}" if snake is not None else "Respawning..."
+        kib = self.connection.received / 1024
+        self.status.config(text=f"{state}  Snakes: {len(self.board.snakes)}  Received: {kib:.0f} KiB")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Join a shared Snake board")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5555)
+    args = parser.parse_args(argv)
+    
+    root = tk.Tk()
+    try:
+        MultiplayerClient(root, args.host, args.port)
+    except OSError as e:
+        print(f"Error connecting to {args.host}:{args.port}: {e}")
+        return 1
+    root.mainloop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
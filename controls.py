@@ -0,0 +1,54 @@
+"""Buffered keyboard input.
+
+Key presses are queued with the time they arrived and the game takes at most
+one per tick, so two quick presses inside one tick become two consecutive
+turns instead of the second overwriting the first. Every queued turn is
+checked against the direction the snake will actually have when it is
+applied, which keeps fast up-then-left style sequences from reversing the
+snake into itself. The time from a key press to the tick that applies it is
+recorded as the input latency.
+"""
+import time
+from collections import deque
+from engine import OPPOSITE_DIRECTIONS
+from profiler import percentiles
+
+class InputQueue:
+    def __init__(self, capacity=3, window=240, clock=time.perf_counter):
+        self.capacity = capacity
+        self.clock = clock
+        self.pending = deque()
+        self.latencies = deque(maxlen=window)
+        self.dropped = 0
+    
+    def clear(self):
+        self.pending.clear()
+    
+    def push(self, direction, current):
+        """Queue a turn; ``current`` is the direction applied on the last tick.
+
+        Presses that would not change the direction after the turns already
+        queued, or would reverse it, are ignored, as are presses beyond the
+        queue's capacity.
+        """
+        last = self.pending[-1][0] if self.pending else current
+        if direction == last or direction == OPPOSITE_DIRECTIONS[last]:
+            return False
+        if len(self.pending) >= self.capacity:
+            self.dropped += 1
+            return False
+        self.pending.append((direction, self.clock()))
+        return True
+    
+    def pop(self, current):
+        """Next turn that is valid from ``current``, or None; records its latency."""
+        while self.pending:
+            direction, pressed_at = self.pending.popleft()
+            if direction != current and direction != OPPOSITE_DIRECTIONS[current]:
+                self.latencies.append((self.clock() - pressed_at) * 1000)
+                return direction
+        return None
+    
+    def latency(self, points=(50, 95, 99)):
+        """Input-to-movement latency percentiles in milliseconds over the recent window."""
+        return percentiles(self.latencies, points)
\ No newline at end of file
@@ -0,0 +1,291 @@
+"""Headless snake rules.
+
+SnakeEngine holds the whole game state and advances it one tick at a time
+through step(). It has no Tkinter or PIL dependency so it can be driven by
+bots, benchmarks and tests at full CPU speed; SnakeGame in main.py renders it.
+"""
+import random
+from events import (
+    DIED, FOOD_EATEN, FOOD_SPAWNED, GOLDEN_APPLE_EATEN, GOLDEN_APPLE_EXPIRED, GOLDEN_APPLE_SPAWNED, HEAD_ADDED,
+    LEVEL_CHANGED, RAINBOW_ENDED, RAINBOW_STARTED, RESET, TAIL_ADDED, TAIL_REMOVED, EventStream
+)
+from grid import OccupancyGrid, SnakeBody
+
+DIRECTIONS = {
+    "up": (0, -1),
+    "down": (0, 1),
+    "left": (-1, 0),
+    "right": (1, 0)
+}
+
+OPPOSITE_DIRECTIONS = {
+    "up": "down",
+    "down": "up",
+    "left": "right",
+    "right": "left"
+}
+
+LEVEL_COLORS = ["#00FF00", "#FFD700", "#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4", "#FFEAA7"]
+
+def new_seed():
+    return random.SystemRandom().getrandbits(32)
+
+class SnakeEngine:
+    def __init__(self, board_width=600, board_height=600, unit_size=25, rng=None, seed=None):
+        self.board_width = board_width
+        self.board_height = board_height
+        self.unit_size = unit_size
+        self.cols = board_width // unit_size
+        self.rows = board_height // unit_size
+        self.grid = OccupancyGrid(self.cols, self.rows)
+        self.body = SnakeBody(self.grid.size + 2)
+        self.rng = rng if rng is not None else random
+        self.profiler = None
+        self.events = None
+        
+        self.reset(seed)
+    
+    def reset(self, seed=None):
+        """Start a new game; a ``seed`` gives it its own reproducible random generator."""
+        self.seed = seed
+        if seed is not None:
+            self.rng = random.Random(seed)
+        start_cell = self.cell_at(100, 100)
+        self.grid.clear()
+        self.body.clear()
+        self.body.push_head(start_cell)
+        self.grid.add(start_cell)
+        self.direction = "right"
+        self.score = 0
+        self.alive = True
+        self.level = 1
+        self.game_speed = 120
+        self.snake_color = LEVEL_COLORS[0]
+        self.golden_apple_cell = None
+        self.golden_apple_timer = 0
+        self.rainbow_effect = False
+        self.rainbow_timer = 0
+        self.ticks = 0
+        
+        self.food_cell = None
+        self.food_cell = self.create_food()
+        self.announce_reset()
+    
+    def place_snake(self, cells, direction):
+        """Replace the snake with ``cells`` (head first) heading in ``direction``."""
+        self.grid.clear()
+        self.body.clear()
+        for cell in cells:
+            self.body.push_tail(cell)
+            self.grid.add(cell)
+        self.direction = direction
+        self.golden_apple_cell = None
+        self.food_cell = None
+        self.food_cell = self.create_food()
+        self.announce_reset()
+    
+    def announce_reset(self):
+        if self.events is not None:
+            self.events.pending.clear()
+            self.emit(RESET)
+            self.emit(FOOD_SPAWNED, self.food_cell)
+            self.events.publish(self.ticks)
+    
+    def subscribe(self, callback, kinds=None):
+        """Deliver each tick's change events to ``callback(tick, events)``; see events.py."""
+        if self.events is None:
+            self.events = EventStream()
+        return self.events.subscribe(callback, kinds)
+    
+    def unsubscribe(self, token):
+        if self.events is None:
+            return
+        self.events.unsubscribe(token)
+        if not self.events:
+            self.events = None
+    
+    def emit(self, kind, value=None):
+        if self.events is not None:
+            self.events.emit(kind, value)
+    
+    @property
+    def snake_body(self):
+        return [self.position_of(cell) for cell in self.body]
+    
+    @property
+    def head_position(self):
+        return self.position_of(self.body.head())
+    
+    @property
+    def food_position(self):
+        return None if self.food_cell is None else self.position_of(self.food_cell)
+    
+    @property
+    def golden_apple_position(self):
+        return None if self.golden_apple_cell is None else self.position_of(self.golden_apple_cell)
+    
+    def cell_at(self, x, y):
+        return (y // self.unit_size) * self.cols + x // self.unit_size
+    
+    def position_of(self, cell):
+        row, col = divmod(cell, self.cols)
+        return [col * self.unit_size, row * self.unit_size]
+    
+    def create_food(self):
+        exclude = -1 if self.golden_apple_cell is None else self.golden_apple_cell
+        return self.grid.random_free(self.rng, exclude)
+    
+    def create_golden_apple(self):
+        exclude = -1 if self.food_cell is None else self.food_cell
+        return self.grid.random_free(self.rng, exclude)
+    
+    def change_direction(self, direction):
+        if direction not in DIRECTIONS or direction == OPPOSITE_DIRECTIONS[self.direction]:
+            return False
+        self.direction = direction
+        return True
+    
+    def next_cell(self, direction=None):
+        """Cell the head would move into, or None if that leaves the board."""
+        dx, dy = DIRECTIONS[direction or self.direction]
+        row, col = divmod(self.body.head(), self.cols)
+        col += dx
+        row += dy
+        if col < 0 or col >= self.cols or row < 0 or row >= self.rows:
+            return None
+        return row * self.cols + col
+    
+    def step(self, direction=None):
+        """Advance one tick. Returns True for food, "golden" for a golden apple, else False.
+        
+        With a profiler attached, each phase of the tick is charged to it.
+        """
+        if not self.alive:
+            return False
+        
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.lap()
+        if direction is not None:
+            self.change_direction(direction)
+        cell = self.next_cell()
+        if profiler is not None:
+            profiler.mark("movement")
+        
+        collided = cell is None or self.grid.counts[cell]
+        if profiler is not None:
+            profiler.mark("collision")
+        if collided:
+            self.die(cell)
+            return False
+        
+        food_eaten = self.advance(cell)
+        if profiler is not None:
+            profiler.mark("food")
+        
+        self.update_golden_apple_spawn()
+        self.update_rainbow()
+        self.ticks += 1
+        if self.events is not None:
+            self.events.publish(self.ticks)
+        if profiler is not None:
+            profiler.mark("golden_apple")
+        
+        return food_eaten
+    
+    def die(self, cell):
+        self.alive = False
+        if self.events is not None:
+            self.events.emit(DIED, cell)
+            self.events.publish(self.ticks)
+    
+    def advance(self, cell):
+        self.body.push_head(cell)
+        self.grid.add(cell)
+        events = self.events
+        if events is not None:
+            events.emit(HEAD_ADDED, cell)
+        
+        food_eaten = self.check_food()
+        if food_eaten == "golden":
+            self.grow_tail()
+        elif not food_eaten:
+            tail = self.body.pop_tail()
+            self.grid.remove(tail)
+            if events is not None:
+                events.emit(TAIL_REMOVED, tail)
+        return food_eaten
+    
+    def check_collision(self, x, y):
+        if x < 0 or x >= self.board_width or y < 0 or y >= self.board_height:
+            return True
+        
+        return self.grid.is_occupied(self.cell_at(x, y))
+    
+    def check_food(self):
+        head = self.body.head()
+        
+        if head == self.food_cell:
+            self.score += 10
+            self.emit(FOOD_EATEN, head)
+            self.update_level()
+            self.food_cell = self.create_food()
+            if self.food_cell is not None:
+                self.emit(FOOD_SPAWNED, self.food_cell)
+            return True
+        
+        if head == self.golden_apple_cell:
+            self.score += 50
+            self.emit(GOLDEN_APPLE_EATEN, head)
+            self.update_level()
+            
+            if not self.rainbow_effect:
+                self.emit(RAINBOW_STARTED)
+            self.rainbow_effect = True
+            self.rainbow_timer = 0
+            
+            self.golden_apple_cell = None
+            self.golden_apple_timer = 0
+            
+            self.grow_tail()
+            return "golden"
+        
+        return False
+    
+    def grow_tail(self):
+        tail = self.body.tail()
+        self.body.push_tail(tail)
+        self.grid.add(tail)
+        self.emit(TAIL_ADDED, tail)
+    
+    def update_golden_apple_spawn(self):
+        self.golden_apple_timer += 1
+        
+        if self.golden_apple_cell is None and self.golden_apple_timer > 100:
+            if self.rng.random() < 0.005:
+                self.golden_apple_cell = self.create_golden_apple()
+                self.golden_apple_timer = 0
+                if self.golden_apple_cell is not None:
+                    self.emit(GOLDEN_APPLE_SPAWNED, self.golden_apple_cell)
+        
+        elif self.golden_apple_cell is not None:
+            if self.golden_apple_timer > 250:
+                self.emit(GOLDEN_APPLE_EXPIRED, self.golden_apple_cell)
+                self.golden_apple_cell = None
+                self.golden_apple_timer = 0
+    
+    def update_rainbow(self):
+        if self.rainbow_effect:
+            self.rainbow_timer += 1
+            if self.rainbow_timer > 300:
+                self.rainbow_effect = False
+                self.rainbow_timer = 0
+                self.emit(RAINBOW_ENDED)
+    
+    def update_level(self):
+        new_level = (self.score // 50) + 1
+        if new_level > self.level:
+            self.level = new_level
+            self.game_speed = max(80, 120 - (self.level * 5))
+            self.snake_color = LEVEL_COLORS[min(self.level - 1, len(LEVEL_COLORS) - 1)]
+            self.emit(LEVEL_CHANGED, self.level)
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""Per-tick change events from SnakeEngine.
+
+While something is subscribed, the engine records what each tick changed as
+(kind, value) pairs and hands the whole list to its subscribers once the
+tick is over, so a consumer can update only what changed instead of reading
+the whole game state again. ``value`` is the packed cell for body, food and
+golden apple events, the new level for LEVEL_CHANGED, the cell the snake
+ran into for DIED (None for a wall), and None otherwise. RESET starts a new
+game or snake; subscribers should read the state afresh when they see it.
+
+    token = engine.subscribe(on_events, (FOOD_EATEN, LEVEL_CHANGED))
+    def on_events(tick, events):
+        for kind, value in events:
+            ...
+    engine.unsubscribe(token)
+
+An engine with no subscribers records nothing.
+"""
+
+HEAD_ADDED = "head_added"
+TAIL_REMOVED = "tail_removed"
+TAIL_ADDED = "tail_added"
+FOOD_SPAWNED = "food_spawned"
+FOOD_EATEN = "food_eaten"
+GOLDEN_APPLE_SPAWNED = "golden_apple_spawned"
+GOLDEN_APPLE_EXPIRED = "golden_apple_expired"
+GOLDEN_APPLE_EATEN = "golden_apple_eaten"
+LEVEL_CHANGED = "level_changed"
+RAINBOW_STARTED = "rainbow_started"
+RAINBOW_ENDED = "rainbow_ended"
+DIED = "died"
+RESET = "reset"
+
+EVENT_KINDS = (
+    HEAD_ADDED,
+    TAIL_REMOVED,
+    TAIL_ADDED,
+    FOOD_SPAWNED,
+    FOOD_EATEN,
+    GOLDEN_APPLE_SPAWNED,
+    GOLDEN_APPLE_EXPIRED,
+    GOLDEN_APPLE_EATEN,
+    LEVEL_CHANGED,
+    RAINBOW_STARTED,
+    RAINBOW_ENDED,
+    DIED,
+    RESET
+)
+
+class EventStream:
+    def __init__(self):
+        self.subscribers = {}
+        self.next_token = 0
+        self.pending = []
+    
+    def __len__(self):
+        return len(self.subscribers)
+    
+    def subscribe(self, callback, kinds=None):
+        """Call ``callback(tick, events)`` after every tick with events of ``kinds`` (default all)."""
+        kinds = None if kinds is None else frozenset(kinds)
+        if kinds is not None and not kinds <= set(EVENT_KINDS):
+            raise ValueError(f"unknown event kinds: {', '.join(sorted(kinds - set(EVENT_KINDS)))}")
+        token = self.next_token
+        self.next_token += 1
+        self.subscribers[token] = (callback, kinds)
+        return token
+    
+    def unsubscribe(self, token):
+        self.subscribers.pop(token, None)
+    
+    def emit(self, kind, value=None):
+        self.pending.append((kind, value))
+    
+    def publish(self, tick):
+        events = self.pending
+        if not events:
+            return
+        self.pending = []
+        for callback, kinds in list(self.subscribers.values()):
+            if kinds is None:
+                callback(tick, events)
+                continue
+            selected = [event for event in events if event[0] in kinds]
+            if selected:
+                callback(tick, selected)
\ No newline at end of file
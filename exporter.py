@@ -0,0 +1,384 @@
+"""Export games to an animated GIF, a PNG sequence or a raw video stream.
+
+    python exporter.py replays/20240101-120000-150.snkr -o game.gif
+    python exporter.py replays/x.snkr -f png -o frames/ --fps 30
+    python exporter.py replays/x.snkr -f raw -o - --fps 30 | \\
+        ffmpeg -f rawvideo -pix_fmt rgb24 -s 600x600 -r 30 -i - game.mp4
+
+Frames are drawn by FrameRenderer with the game's own sprites, not grabbed
+from the window, so export works headless and runs as fast as the machine
+allows. The work is a pipeline: Replay.states() yields the game state tick
+by tick, game_frames() renders each state, and Exporter hands the frames to
+a pool of worker threads that encode them while the next ones are drawn.
+Encoded frames are written in order as soon as they are ready, and at most
+``buffer`` frames are in flight at once, so memory stays the same for a
+one-minute game and a thirty-minute one. Frames are never larger than
+VIEW_SIZE, the game's 600x600 window: a game played on a larger world
+(SNAKE_WORLD) is exported through a camera that follows the head, as the
+game shows it, so the world size does not change memory either.
+
+GIFs are written frame by frame with one fixed palette. Only the part of a
+frame that changed since the previous one is encoded, and a tick that
+changes nothing makes the previous frame last longer. --fps resamples PNG
+sequences and raw streams to a constant frame rate; without it they get one
+frame per tick.
+
+LiveExport records a game while it is played: set SNAKE_EXPORT=gif (or png
+or raw) and every game is also written to the exports/ folder next to this
+file.
+"""
+import argparse
+import itertools
+import os
+import struct
+import sys
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from PIL import GifImagePlugin, Image, ImageChops
+from engine import LEVEL_COLORS
+from offscreen import BOARD_COLOR, FrameRenderer
+from palette import RAINBOW_SIZE, RAINBOW_TABLE, body_palette
+from renderer import BODY_OUTLINE, HEAD_OUTLINE
+from replay import Replay, ReplayError
+
+FORMATS = ("gif", "png", "raw")
+EXPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "exports")
+# main.BOARD_WIDTH x BOARD_HEIGHT; a larger board is exported through a camera this size.
+VIEW_SIZE = (600, 600)
+DEFAULT_BUFFER = 16
+END_HOLD_MS = 1500
+RAINBOW_COLORS = 32
+TRANSPARENT_INDEX = 255
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Outlines, eyes, scales, apple rings and the sprite-less fallbacks drawn by FrameRenderer.
+FIXED_COLORS = (
+    BOARD_COLOR, BODY_OUTLINE, HEAD_OUTLINE, "#000000", "#444444", "#666666",
+    "#FFD700", "#FFA500", "#ff3333", "#cc0000"
+)
+
+CHANGED = [0] + [255] * 255
+UNCHANGED = [255] + [0] * 255
+
+def hex_rgb(color):
+    return Image.new("RGB", (1, 1), color).getpixel((0, 0))
+
+def gif_palette(renderer, colors=TRANSPARENT_INDEX):
+    """A palette image holding every color the snake can have, with the rest shared by the scenery.
+
+    Index TRANSPARENT_INDEX is left out: GifSink uses it for pixels that did not change.
+    """
+    fixed = []
+    for color in FIXED_COLORS + tuple(color for level in LEVEL_COLORS for color in body_palette(level)):
+        rgb = hex_rgb(color)
+        if rgb not in fixed:
+            fixed.append(rgb)
+    for index in range(RAINBOW_COLORS):
+        rgb = hex_rgb(RAINBOW_TABLE[index * RAINBOW_SIZE // RAINBOW_COLORS])
+        if rgb not in fixed:
+            fixed.append(rgb)
+    
+    scenery = []
+    sprites = [sprite for sprite in (renderer.apple, renderer.golden_apple) if sprite is not None]
+    budget = colors - len(fixed)
+    if sprites:
+        sheet = Image.new("RGB", (sum(sprite.width for sprite in sprites), max(sprite.height for sprite in sprites)))
+        x = 0
+        for sprite in sprites:
+            sheet.paste(renderer.background.crop((0, 0) + sprite.size), (x, 0))
+            sheet.paste(sprite, (x, 0), sprite if sprite.mode == "RGBA" else None)
+            x += sprite.width
+        scenery.append((sheet, budget // 2))
+        budget -= budget // 2
+    scenery.append((renderer.background, budget))
+    
+    entries = list(fixed)
+    for image, count in scenery:
+        quantized = image.quantize(count, method=Image.Quantize.MEDIANCUT)
+        used = len(quantized.getcolors(count) or ())
+        palette = quantized.getpalette()[:used * 3]
+        entries.extend(tuple(palette[index:index + 3]) for index in range(0, len(palette), 3))
+    entries = entries[:colors]
+    entries.extend([(0, 0, 0)] * (256 - len(entries)))
+    
+    image = Image.new("P", (1, 1))
+    image.putpalette([value for entry in entries for value in entry])
+    return image
+
+class Sink(ABC):
+    """Where encoded frames go. encode() runs on a worker thread, write() in frame order."""
+    
+    def __init__(self, fps=None):
+        self.fps = fps
+        self.elapsed = 0
+        self.written = 0
+    
+    def repeats(self, duration):
+        """How many output frames a frame shown for ``duration`` ms takes up."""
+        if self.fps is None:
+            return 1
+        start = self.elapsed * self.fps // 1000
+        self.elapsed += duration
+        return self.elapsed * self.fps // 1000 - start
+    
+    @abstractmethod
+    def encode(self, frame, previous):
+        pass
+    
+    @abstractmethod
+    def write(self, data, duration):
+        pass
+    
+    def close(self):
+        pass
+
+class GifSink(Sink):
+    def __init__(self, path, size, palette, loop=0):
+        super().__init__()
+        self.palette = palette
+        self.pending = None
+        self.pending_ms = 0
+        self.shown_ms = 0
+        self.file = open(path, "wb")
+        colors = palette.getpalette()[:768]
+        colors.extend([0] * (768 - len(colors)))
+        self.file.write(
+            b"GIF89a" + struct.pack("<HHBBB", size[0], size[1], 0xF7, 0, 0) + bytes(colors)
+            + b"\x21\xFF\x0BNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\x00"
+        )
+    
+    def encode(self, frame, previous):
+        """The changed part of ``frame`` as a GIF image block, or None if nothing changed.
+
+        Unchanged pixels inside the changed box are made transparent, so the
+        previous frame shows through and LZW packs them into long runs.
+        """
+        if previous is None:
+            return b"".join(GifImagePlugin.getdata(self.quantize(frame), interlace=False))
+        difference = ImageChops.difference(frame, previous)
+        box = difference.getbbox()
+        if box is None:
+            return None
+        region = self.quantize(frame.crop(box))
+        unchanged = difference.crop(box).point(CHANGED * 3).convert("L").point(UNCHANGED)
+        region.paste(TRANSPARENT_INDEX, mask=unchanged)
+        return b"".join(GifImagePlugin.getdata(region, offset=box[:2], interlace=False))
+    
+    def quantize(self, image):
+        return image.quantize(palette=self.palette, dither=Image.Dither.NONE)
+    
+    def write(self, data, duration):
+        # Hold each frame back until the next change, so unchanged ticks only add to its delay.
+        if data is None:
+            self.pending_ms += duration
+            return
+        self.flush()
+        self.pending = data
+        self.pending_ms = duration
+    
+    def flush(self):
+        if self.pending is None:
+            return
+        # Delays are in centiseconds; round the running total so the error does not add up.
+        start = (self.shown_ms + 5) // 10
+        self.shown_ms += self.pending_ms
+        delay = min(0xFFFF, max(1, (self.shown_ms + 5) // 10 - start))
+        # Disposal 1 keeps each frame on screen under the next; transparency flag on.
+        self.file.write(b"\x21\xF9\x04\x05" + struct.pack("<HB", delay, TRANSPARENT_INDEX) + b"\x00")
+        self.file.write(self.pending)
+        self.written += 1
+        self.pending = None
+    
+    def close(self):
+        self.flush()
+        self.file.write(b";")
+        self.file.close()
+
+def png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+def encode_png(frame, level=1):
+    """An RGB frame as PNG with unfiltered rows.
+
+    PIL tries every row filter, which costs more than the compression itself;
+    board frames come out about the same size without them.
+    """
+    width, height = frame.size
+    raw = frame.tobytes()
+    stride = width * 3
+    rows = b"".join(b"\x00" + raw[offset:offset + stride] for offset in range(0, len(raw), stride))
+    return (
+        PNG_SIGNATURE + png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + png_chunk(b"IDAT", zlib.compress(rows, level)) + png_chunk(b"IEND", b"")
+    )
+
+class PngSequenceSink(Sink):
+    def __init__(self, directory, fps=None, compress_level=1):
+        super().__init__(fps)
+        self.directory = directory
+        self.compress_level = compress_level
+        os.makedirs(directory, exist_ok=True)
+    
+    def encode(self, frame, previous):
+        return encode_png(frame, self.compress_level)
+    
+    def write(self, data, duration):
+        for _ in range(self.repeats(duration)):
+            with open(os.path.join(self.directory, f"frame_{self.written:06d}.png"), "wb") as f:
+                f.write(data)
+            self.written += 1
+
+class RawSink(Sink):
+    """Frames as packed rgb24, for ``ffmpeg -f rawvideo -pix_fmt rgb24``; ``-`` writes to stdout."""
+    
+    def __init__(self, path, fps=None):
+        super().__init__(fps)
+        self.stdout = path == "-"
+        self.file = sys.stdout.buffer if self.stdout else open(path, "wb")
+    
+    def encode(self, frame, previous):
+        return frame.tobytes()
+    
+    def write(self, data, duration):
+        for _ in range(self.repeats(duration)):
+            self.file.write(data)
+            self.written += 1
+    
+    def close(self):
+        if self.stdout:
+            self.file.flush()
+        else:
+            self.file.close()
+
+def open_sink(fmt, output, renderer, fps=None):
+    if fmt == "gif":
+        return GifSink(output, renderer.frame.size, gif_palette(renderer))
+    if fmt == "png":
+        return PngSequenceSink(output, fps)
+    if fmt == "raw":
+        return RawSink(output, fps)
+    raise ValueError(f"unknown export format {fmt!r}; use one of {', '.join(FORMATS)}")
+
+class Exporter:
+    """Encodes frames on a thread pool and writes them in order, with at most ``buffer`` in flight."""
+    
+    def __init__(self, sink, workers=None, buffer=DEFAULT_BUFFER):
+        self.sink = sink
+        self.buffer = max(1, buffer)
+        self.pool = ThreadPoolExecutor(workers or os.cpu_count(), thread_name_prefix="snake-export")
+        self.in_flight = deque()
+        self.previous = None
+        self.frames = 0
+        self.game_ms = 0
+    
+    def add(self, frame, duration):
+        """Queue ``frame`` (copied, so a reused buffer is fine), shown for ``duration`` ms.
+
+        Blocks while ``buffer`` frames are waiting to be encoded and written.
+        """
+        frame = frame.copy()
+        self.in_flight.append((self.pool.submit(self.sink.encode, frame, self.previous), duration))
+        self.previous = frame
+        self.frames += 1
+        self.game_ms += duration
+        while len(self.in_flight) >= self.buffer:
+            self.write_next()
+    
+    def write_next(self):
+        future, duration = self.in_flight.popleft()
+        self.sink.write(future.result(), duration)
+    
+    def close(self):
+        try:
+            while self.in_flight:
+                self.write_next()
+        finally:
+            self.pool.shutdown()
+            self.sink.close()
+
+def game_frames(states, renderer):
+    """(frame, ms until the next tick) for every engine state; the last frame is held for END_HOLD_MS."""
+    for engine in states:
+        yield renderer.render(), engine.game_speed if engine.alive else END_HOLD_MS
+
+def export_replay(replay, fmt, output, fps=None, workers=None, buffer=DEFAULT_BUFFER, view_size=VIEW_SIZE):
+    """Export ``replay`` and return (frames rendered, game length in ms, frames written)."""
+    states = replay.states()
+    engine = next(states)
+    renderer = FrameRenderer.from_assets(engine, view_size)
+    sink = open_sink(fmt, output, renderer, fps)
+    exporter = Exporter(sink, workers, buffer)
+    try:
+        for frame, duration in game_frames(itertools.chain([engine], states), renderer):
+            exporter.add(frame, duration)
+    finally:
+        exporter.close()
+    return exporter.frames, exporter.game_ms, sink.written
+
+class LiveExport:
+    """Exports a game while it is played: one frame each time the engine publishes a tick."""
+    
+    def __init__(self, engine, fmt, output, fps=None, workers=None, buffer=DEFAULT_BUFFER, view_size=VIEW_SIZE):
+        self.engine = engine
+        self.renderer = FrameRenderer.from_assets(engine, view_size)
+        self.exporter = Exporter(open_sink(fmt, output, self.renderer, fps), workers, buffer)
+        self.exporter.add(self.renderer.render(), engine.game_speed)
+        self.token = engine.subscribe(self.on_tick)
+    
+    def on_tick(self, tick, events):
+        engine = self.engine
+        self.exporter.add(self.renderer.render(), engine.game_speed if engine.alive else END_HOLD_MS)
+    
+    def close(self):
+        self.engine.unsubscribe(self.token)
+        self.exporter.close()
+
+def export_path(fmt, directory=EXPORT_DIR):
+    """A new file name in ``directory``; a PNG sequence gets a folder of that name."""
+    # Names only change once a second, so a game that ends quickly must not overwrite the last one.
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    for number in itertools.count():
+        name = stamp if number == 0 else f"{stamp}-{number}"
+        path = os.path.join(directory, name if fmt == "png" else f"{name}.{fmt}")
+        if not os.path.exists(path):
+            return path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a Snake replay as a GIF, PNG sequence or raw video")
+    parser.add_argument("replay")
+    parser.add_argument("-f", "--format", choices=FORMATS, help="default: from the output name, else gif")
+    parser.add_argument("-o", "--output", help="file, directory for png, or - for raw on stdout")
+    parser.add_argument("--fps", type=int, help="constant frame rate for png and raw (default: one frame per tick)")
+    parser.add_argument("-j", "--workers", type=int, help="encoding threads (default: one per CPU)")
+    parser.add_argument("--buffer", type=int, default=DEFAULT_BUFFER, help="frames in flight at most")
+    args = parser.parse_args(argv)
+    
+    fmt = args.format
+    if fmt is None:
+        extension = os.path.splitext(args.output or "")[1].lstrip(".").lower()
+        fmt = extension if extension in FORMATS else "gif"
+    output = args.output or os.path.splitext(os.path.basename(args.replay))[0] + ("" if fmt == "png" else f".{fmt}")
+    try:
+        replay = Replay.load(args.replay)
+    except (OSError, ReplayError) as e:
+        print(f"Error loading replay: {e}", file=sys.stderr)
+        return 1
+    
+    start = time.perf_counter()
+    try:
+        frames, game_ms, written = export_replay(replay, fmt, output, args.fps, args.workers, args.buffer)
+    except OSError as e:
+        print(f"Error exporting replay: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    print(
+        f"{output}: {frames} ticks, {written} frames written, {game_ms / 1000:.1f}s of play "
+        f"exported in {elapsed:.2f}s ({frames / elapsed:.0f} ticks/s, {game_ms / 1000 / elapsed:.0f}x real time)",
+        file=sys.stderr
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
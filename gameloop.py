@@ -0,0 +1,89 @@
+"""Fixed-timestep game loop driven by Tk's after().
+
+Ticks are scheduled against absolute deadlines on a monotonic clock, so the
+time spent in game logic and drawing does not stretch the tick period. When
+the loop wakes up late it runs every tick that is due (up to max_catch_up)
+and then renders once, which keeps the simulation at the speed set by the
+level even when frames have to be skipped.
+
+Frames are only drawn after ticks, never between them. The game has no
+interpolation and its particles advance in the tick, so a frame between two
+ticks would redraw the same picture. The render cadence is therefore the
+tick rate, or lower when the loop falls behind.
+
+``root`` only needs after() and after_cancel(), so a scheduler.Scheduler can
+be passed instead of the Tk root to tie the loop to a screen's lifetime.
+"""
+import time
+
+class FixedStepLoop:
+    def __init__(self, root, tick, render, interval, max_catch_up=5, clock=time.monotonic):
+        self.root = root
+        self.tick = tick
+        self.render = render
+        self.interval = interval
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        self.profiler = None
+        
+        self.after_id = None
+        self.running = False
+        self.next_tick_at = 0.0
+        self.ticks = 0
+        self.frames = 0
+        self.dropped_ticks = 0
+    
+    def start(self):
+        self.stop()
+        if self.profiler is not None:
+            self.profiler.skip_idle()
+        self.running = True
+        self.next_tick_at = self.clock() + self.interval() / 1000
+        self.schedule()
+    
+    def stop(self):
+        self.running = False
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+    
+    def schedule(self):
+        delay = max(1, round((self.next_tick_at - self.clock()) * 1000))
+        self.after_id = self.root.after(delay, self.run_due_ticks)
+    
+    def run_due_ticks(self):
+        self.after_id = None
+        if not self.running:
+            return
+        
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin_frame()
+        
+        steps = 0
+        now = self.clock()
+        while now >= self.next_tick_at:
+            if steps == self.max_catch_up:
+                behind = int((now - self.next_tick_at) * 1000 // self.interval()) + 1
+                self.dropped_ticks += behind
+                self.next_tick_at = now + self.interval() / 1000
+                break
+            
+            self.ticks += 1
+            steps += 1
+            if profiler is not None:
+                profiler.count_tick()
+            if not self.tick():
+                self.running = False
+                if profiler is not None:
+                    profiler.end_frame()
+                return
+            self.next_tick_at += self.interval() / 1000
+            now = self.clock()
+        
+        if steps:
+            self.render()
+            self.frames += 1
+        if profiler is not None:
+            profiler.end_frame()
+        self.schedule()
\ No newline at end of file
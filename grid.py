@@ -0,0 +1,170 @@
+"""Cell-indexed board structures shared by the engines.
+
+Cells are packed as ``row * cols + col``.
+"""
+from array import array
+from functools import lru_cache
+
+class OccupancyGrid:
+    """Per-cell occupancy counts plus an index of the free cells.
+    
+    ``free`` is a permutation of every cell whose first ``free_count`` entries
+    are the unoccupied cells and ``free_slot`` maps a cell back to its slot,
+    so marking, unmarking and picking a uniformly random free cell are O(1).
+    Counts rather than flags are kept because a growing snake stacks copies of
+    its tail on one cell.
+    """
+    
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.size = cols * rows
+        self.clear()
+    
+    def clear(self):
+        self.counts = bytearray(self.size)
+        self.free = array('i', range(self.size))
+        self.free_slot = array('i', range(self.size))
+        self.free_count = self.size
+    
+    def cell(self, col, row):
+        return row * self.cols + col
+    
+    def in_bounds(self, col, row):
+        return 0 <= col < self.cols and 0 <= row < self.rows
+    
+    def is_occupied(self, cell):
+        return self.counts[cell] != 0
+    
+    def add(self, cell):
+        count = self.counts[cell]
+        if count == 0:
+            self._swap_free(cell, self.free_count - 1)
+            self.free_count -= 1
+        self.counts[cell] = count + 1
+    
+    def remove(self, cell):
+        count = self.counts[cell] - 1
+        self.counts[cell] = count
+        if count == 0:
+            self._swap_free(cell, self.free_count)
+            self.free_count += 1
+    
+    def random_free(self, rng, exclude=-1):
+        """Return a random free cell other than ``exclude``, or None when there is none."""
+        free_count = self.free_count
+        if free_count == 0 or (free_count == 1 and self.free[0] == exclude):
+            return None
+        while True:
+            cell = self.free[rng.randrange(free_count)]
+            if cell != exclude:
+                return cell
+    
+    def _swap_free(self, cell, slot):
+        free = self.free
+        free_slot = self.free_slot
+        other = free[slot]
+        old_slot = free_slot[cell]
+        free[slot] = cell
+        free_slot[cell] = slot
+        free[old_slot] = other
+        free_slot[other] = old_slot
+
+def hamiltonian_cycle(cols, rows):
+    """Cells of a closed path visiting every cell once; needs an even number of rows or columns."""
+    if rows % 2 and cols % 2 == 0:
+        transposed = hamiltonian_cycle(rows, cols)
+        return [(cell % rows) * cols + cell // rows for cell in transposed]
+    if rows % 2 or cols < 2:
+        raise ValueError("a Hamiltonian cycle needs an even number of rows or columns")
+    
+    path = [col for col in range(cols)]
+    for row in range(1, rows):
+        columns = range(cols - 1, 0, -1) if row % 2 else range(1, cols)
+        path.extend(row * cols + col for col in columns)
+    path.extend(row * cols for row in range(rows - 1, 0, -1))
+    return path
+
+def cycle_directions(cols, cycle):
+    """Direction name from every cell to the one after it on ``cycle``, indexed by cell."""
+    names = {-cols: "up", cols: "down", -1: "left", 1: "right"}
+    directions = [None] * len(cycle)
+    for index, cell in enumerate(cycle):
+        directions[cell] = names[cycle[(index + 1) % len(cycle)] - cell]
+    return directions
+
+@lru_cache(maxsize=None)
+def cycle_for(cols, rows):
+    """Cycle direction for every cell, or None when the board has no Hamiltonian cycle."""
+    try:
+        return cycle_directions(cols, hamiltonian_cycle(cols, rows))
+    except ValueError:
+        return None
+
+class SnakeBody:
+    """Ring buffer of packed cell indices, head first.
+    
+    Storage starts small and doubles as the snake grows, up to ``max_length``
+    cells, so a short snake on a huge board stays cheap.
+    """
+    
+    def __init__(self, max_length, initial_capacity=256):
+        self.max_length = max_length
+        self.capacity = min(max_length, initial_capacity)
+        self.cells = array('i', bytes(4 * self.capacity))
+        self.clear()
+    
+    def clear(self):
+        self.start = 0
+        self.length = 0
+    
+    def __len__(self):
+        return self.length
+    
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("snake body index out of range")
+        return self.cells[(self.start + index) % self.capacity]
+    
+    def __iter__(self):
+        cells = self.cells
+        capacity = self.capacity
+        start = self.start
+        end = start + self.length
+        if end <= capacity:
+            return iter(cells[start:end])
+        return iter(cells[start:] + cells[:end - capacity])
+    
+    def head(self):
+        return self.cells[self.start]
+    
+    def tail(self):
+        return self.cells[(self.start + self.length - 1) % self.capacity]
+    
+    def grow(self):
+        if self.capacity == self.max_length:
+            raise IndexError("snake body is full")
+        cells = array('i', iter(self))
+        self.capacity = min(self.max_length, self.capacity * 2)
+        cells.frombytes(bytes(4 * (self.capacity - self.length)))
+        self.cells = cells
+        self.start = 0
+    
+    def push_head(self, cell):
+        if self.length == self.capacity:
+            self.grow()
+        self.start = (self.start - 1) % self.capacity
+        self.cells[self.start] = cell
+        self.length += 1
+    
+    def push_tail(self, cell):
+        if self.length == self.capacity:
+            self.grow()
+        self.cells[(self.start + self.length) % self.capacity] = cell
+        self.length += 1
+    
+    def pop_tail(self):
+        self.length -= 1
+        return self.cells[(self.start + self.length) % self.capacity]
\ No newline at end of file
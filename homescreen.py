@@ -1,9 +1,12 @@
+import startup
 import tkinter as tk
 from tkinter import messagebox
 import random
-import os
-from PIL import Image, ImageTk
 import math
+import threading
+import time
+from leaderboard import Leaderboard
+from scheduler import Scheduler
 
 class HomeScreen:
     def __init__(self, root):
@@ -16,13 +19,14 @@ class HomeScreen:
         self.animation_frame = 0
         self.snake_demo_positions = []
         
-        self.high_score = self.load_high_score()
+        self.leaderboard = Leaderboard()
+        self.high_score = self.leaderboard.best_score()
         
         self.center_window()
         
         self.create_widgets()
         
-        self.animate_background()
+        self.root.after_idle(self.menu_shown)
         
     def center_window(self):
         self.root.update_idletasks()
@@ -44,6 +48,7 @@ class HomeScreen:
             highlightthickness=0
         )
         self.bg_canvas.pack(fill="both", expand=True)
+        self.scheduler = Scheduler(self.bg_canvas, "homescreen")
         
         self.create_background_pattern()
         
@@ -83,6 +88,7 @@ class HomeScreen:
         self.create_custom_button()
         
         self.display_high_score()
+        self.refresh_high_score()
         
         self.bg_canvas.create_text(
             300, 500,
@@ -93,44 +99,35 @@ class HomeScreen:
         )
         
         self.create_corner_decorations()
+        
+        self.scheduler.every(50, self.animate_background)
             
+    def menu_shown(self):
+        startup.mark("menu_first_frame")
+        threading.Thread(target=self.preload, name="preload", daemon=True).start()
+    
+    def preload(self):
+        """Import the game and decode its images while the menu is showing."""
+        try:
+            import main
+            main.preload_assets()
+            startup.mark("assets_preloaded")
+        except Exception as e:
+            print(f"Error preloading game assets: {e}")
+    
     def start_game(self):
+        clicked_at = time.perf_counter()
         try:
             from main import SnakeGame
-            game = SnakeGame(self.root, self)
+            game = SnakeGame(self.root, self, clicked_at)
         except Exception as e:
             messagebox.showerror("Error", f"Could not start game: {e}")
     
-    def load_high_score(self):
-        try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            score_file = os.path.join(current_dir, "highscore.txt")
-            
-            if os.path.exists(score_file):
-                with open(score_file, 'r') as f:
-                    return int(f.read().strip())
-            else:
-                return 0
-        except:
-            return 0
-    
-    def save_high_score(self, score):
-        try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            score_file = os.path.join(current_dir, "highscore.txt")
-            
-            with open(score_file, 'w') as f:
-                f.write(str(score))
-            
-            self.high_score = score
-        except:
-            pass
-    
-    def update_high_score(self, new_score):
-        if new_score > self.high_score:
-            self.save_high_score(new_score)
-            return True
-        return False
+    def record_game(self, score, level, length, duration):
+        """Add a finished game to the leaderboard; returns True for a new high score."""
+        is_new_high_score = self.leaderboard.record(score, level, length, duration)
+        self.high_score = self.leaderboard.best_score()
+        return is_new_high_score
     
     def display_high_score(self):
         self.bg_canvas.create_rectangle(
@@ -151,9 +148,18 @@ class HomeScreen:
             text=f"{self.high_score:,}",
             font=("Impact", 18, "bold"),
             fill="#FFFFFF",
-            anchor="center"
+            anchor="center",
+            tags="high_score"
         )
     
+    def refresh_high_score(self):
+        # The leaderboard opens its database on its own thread; show the score once it has.
+        if not self.leaderboard.ready.is_set():
+            self.scheduler.after(50, self.refresh_high_score)
+            return
+        self.high_score = self.leaderboard.best_score()
+        self.bg_canvas.itemconfig("high_score", text=f"{self.high_score:,}")
+    
     def create_background_pattern(self):
         for x in range(0, 600, 30):
             for y in range(0, 700, 30):
@@ -296,8 +302,6 @@ class HomeScreen:
                 fill="#ff3333", outline="#ffff00", width=2,
                 tags="demo_apple"
             )
-        
-        self.root.after(50, self.animate_background)
 
 class MainApp:
     def __init__(self):
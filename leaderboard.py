@@ -0,0 +1,245 @@
+"""Local leaderboard of every finished game, stored in SQLite.
+
+The database runs in WAL mode so reads never wait for the writer. A
+background thread opens it, and then commits finished games in batches, so
+neither creating a Leaderboard nor recording a game touches the disk on the
+Tk thread; ``ready`` is set once the database is open. The best score is kept in
+memory, and top-N and per-day query results are cached until the next
+recorded game. Queries also include games that are still queued for
+writing, so results are current immediately.
+
+The old highscore.txt is imported on first use and renamed to
+highscore.txt.migrated.
+
+    python leaderboard.py            # top 10 of all time
+    python leaderboard.py --today    # top 10 of today
+"""
+import argparse
+import atexit
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from collections import namedtuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, "leaderboard.db")
+LEGACY_HIGH_SCORE = os.path.join(BASE_DIR, "highscore.txt")
+
+GameResult = namedtuple("GameResult", "score level length duration finished_at day")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    finished_at REAL NOT NULL,
+    day TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_score ON games (score DESC);
+CREATE INDEX IF NOT EXISTS games_by_day ON games (day, score DESC);
+"""
+COLUMNS = "score, level, length, duration, finished_at, day"
+
+_leaderboards = weakref.WeakSet()
+
+def day_of(timestamp):
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+@atexit.register
+def close_all():
+    """Write out every open leaderboard's queued games before the process exits."""
+    for leaderboard in list(_leaderboards):
+        leaderboard.close()
+
+def connect(path):
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+class Leaderboard:
+    def __init__(self, path=DB_PATH, batch_size=64, flush_interval=0.5, legacy_path=LEGACY_HIGH_SCORE):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        
+        # Opened on first query; the writer thread creates the database first.
+        self.connection = None
+        self.ready = threading.Event()
+        # lock guards pending and cache; commit_lock keeps queries from seeing a
+        # batch both in the database and in pending.
+        self.lock = threading.Lock()
+        self.commit_lock = threading.Lock()
+        self.pending = []
+        self.cache = {}
+        self.generation = 0
+        self.best = 0
+        
+        self.queue = queue.Queue()
+        self.writer = threading.Thread(
+            target=self.write_batches, args=(legacy_path,), name="leaderboard-writer", daemon=True
+        )
+        self.writer.start()
+        _leaderboards.add(self)
+    
+    def open(self, legacy_path):
+        """Create the database, import highscore.txt and read the best score; runs on the writer thread."""
+        connection = connect(self.path)
+        connection.executescript(SCHEMA)
+        self.migrate(connection, legacy_path)
+        best = connection.execute("SELECT COALESCE(MAX(score), 0) FROM games").fetchone()[0]
+        with self.lock:
+            self.best = max(self.best, best)
+        return connection
+    
+    def migrate(self, connection, legacy_path):
+        if not legacy_path or not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path) as f:
+                score = int(f.read().strip() or 0)
+            finished_at = os.path.getmtime(legacy_path)
+            with connection:
+                connection.execute(
+                    f"INSERT INTO games ({COLUMNS}) VALUES (?, 0, 0, 0, ?, ?)",
+                    (score, finished_at, day_of(finished_at))
+                )
+            os.replace(legacy_path, legacy_path + ".migrated")
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"Error importing {legacy_path}: {e}")
+    
+    def best_score(self):
+        """Best score recorded so far; until ``ready`` is set, only this session's games count."""
+        return self.best
+    
+    def record(self, score, level, length, duration, finished_at=None):
+        """Queue a finished game; returns True when it sets a new best score.
+        
+        Never waits for the database. The writer thread writes queued games once
+        it has opened it, and merges the stored best score into ``best`` then.
+        """
+        if finished_at is None:
+            finished_at = time.time()
+        game = GameResult(score, level, length, duration, finished_at, day_of(finished_at))
+        with self.lock:
+            self.pending.append(game)
+            self.invalidate()
+            new_best = score > self.best
+            if new_best:
+                self.best = score
+            self.queue.put(game)
+        return new_best
+    
+    def invalidate(self):
+        self.cache.clear()
+        self.generation += 1
+    
+    def top(self, limit=10):
+        """Best ``limit`` games of all time, highest score first."""
+        return self.query(("top", limit), f"SELECT {COLUMNS} FROM games ORDER BY score DESC LIMIT ?", (limit,), limit)
+    
+    def top_of_day(self, day=None, limit=10):
+        """Best ``limit`` games of one day (``YYYY-MM-DD``, default today)."""
+        day = day or day_of(time.time())
+        return self.query(
+            ("day", day, limit), f"SELECT {COLUMNS} FROM games WHERE day = ? ORDER BY score DESC LIMIT ?",
+            (day, limit), limit, lambda game: game.day == day
+        )
+    
+    def query(self, key, sql, parameters, limit, keep=None):
+        with self.lock:
+            cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        self.ready.wait()
+        with self.commit_lock:
+            if self.connection is None:
+                self.connection = connect(self.path)
+            with self.lock:
+                pending = [game for game in self.pending if keep is None or keep(game)]
+                generation = self.generation
+            rows = [GameResult(*row) for row in self.connection.execute(sql, parameters)]
+        games = sorted(rows + pending, key=lambda game: -game.score)[:limit]
+        with self.lock:
+            if generation == self.generation:
+                self.cache[key] = games
+        return games
+    
+    def write_batches(self, legacy_path):
+        try:
+            connection = self.open(legacy_path)
+        except sqlite3.Error as e:
+            print(f"Error opening the leaderboard: {e}")
+            connection = None
+        finally:
+            self.ready.set()
+        
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get(timeout=max(0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                running = False
+                batch.pop()
+            
+            if batch:
+                with self.commit_lock:
+                    try:
+                        if connection is not None:
+                            with connection:
+                                connection.executemany(f"INSERT INTO games ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)", batch)
+                    except sqlite3.Error as e:
+                        print(f"Error saving games to the leaderboard: {e}")
+                    with self.lock:
+                        del self.pending[:len(batch)]
+                        self.invalidate()
+            for _ in range(len(batch) + (not running)):
+                self.queue.task_done()
+        if connection is not None:
+            connection.close()
+    
+    def flush(self):
+        """Block until every recorded game has been written."""
+        self.queue.join()
+    
+    def close(self):
+        _leaderboards.discard(self)
+        if self.writer.is_alive():
+            self.queue.put(None)
+            self.writer.join()
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the Snake Game leaderboard")
+    parser.add_argument("-n", "--limit", type=int, default=10, help="number of games to show")
+    parser.add_argument("--today", action="store_true", help="only today's games")
+    parser.add_argument("--day", help="only games of this day (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+    
+    leaderboard = Leaderboard()
+    if args.today or args.day:
+        games = leaderboard.top_of_day(args.day, args.limit)
+    else:
+        games = leaderboard.top(args.limit)
+    print(f"{'#':>3} {'score':>7} {'level':>6} {'length':>7} {'time':>8}  finished")
+    for rank, game in enumerate(games, 1):
+        finished = time.strftime("%Y-%m-%d %H:%M", time.localtime(game.finished_at))
+        print(f"{rank:>3} {game.score:>7} {game.level:>6} {game.length:>7} {game.duration:>7.0f}s  {finished}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
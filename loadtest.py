@@ -0,0 +1,138 @@
+"""Simulated players for server.py.
+
+    python server.py --board 128x128 &
+    python loadtest.py --clients 300 --seconds 30
+
+Opens ``--clients`` connections, each of which turns at random now and then
+like a player would. Every client records when each DELTA arrives and how
+many bytes it received. The report gives the gap between consecutive ticks
+as seen by the clients (its spread around the server's tick length is the
+tick jitter), ticks lost or repeated, and the bandwidth per client. With
+--verify, the first client also keeps a full BoardState and checks that
+every delta applies cleanly to it.
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from profiler import percentile
+from protocol import DELTA, SNAPSHOT, WELCOME, BoardState, FrameDecoder, decode_delta, decode_welcome
+from replay import read_varint
+
+class SimulatedPlayer:
+    def __init__(self, rng, turn_chance, verify=False):
+        self.rng = rng
+        self.turn_chance = turn_chance
+        self.verify = verify
+        self.decoder = FrameDecoder()
+        self.board = None
+        self.tick_ms = None
+        self.received = 0
+        self.last_tick = None
+        self.last_arrival = None
+        self.gaps = []
+        self.missed = 0
+        self.errors = 0
+    
+    async def play(self, host, port, until):
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while time.perf_counter() < until:
+                try:
+                    data = await asyncio.wait_for(reader.read(65536), until - time.perf_counter())
+                except asyncio.TimeoutError:
+                    break
+                if not data:
+                    break
+                self.received += len(data)
+                arrived = time.perf_counter()
+                ticked = False
+                for payload in self.decoder.feed(data):
+                    ticked |= self.handle(payload, arrived)
+                if ticked and self.rng.random() < self.turn_chance:
+                    writer.write(bytes([self.rng.randrange(4)]))
+        finally:
+            writer.close()
+    
+    def handle(self, payload, arrived):
+        kind = payload[0]
+        if kind == WELCOME:
+            _, cols, rows, self.tick_ms = decode_welcome(payload)
+            self.board = BoardState(cols, rows)
+            return False
+        if kind == SNAPSHOT:
+            if self.verify:
+                self.board.apply_snapshot(payload)
+            self.last_tick, _ = read_varint(payload, 1)
+            return False
+        if kind != DELTA:
+            return False
+        
+        if self.verify:
+            try:
+                self.board.apply_delta(decode_delta(payload))
+            except (KeyError, IndexError) as e:
+                self.errors += 1
+                print(f"Error applying tick: {e}")
+        tick, _ = read_varint(payload, 1)
+        if self.last_tick is not None and tick != self.last_tick + 1:
+            self.missed += 1
+        if self.last_arrival is not None:
+            self.gaps.append((arrived - self.last_arrival) * 1000)
+        self.last_tick = tick
+        self.last_arrival = arrived
+        return True
+
+async def run(host, port, clients, seconds, turn_chance, seed, verify):
+    rng = random.Random(seed)
+    players = [SimulatedPlayer(random.Random(rng.random()), turn_chance, verify and index == 0) for index in range(clients)]
+    start = time.perf_counter()
+    until = start + seconds
+    results = await asyncio.gather(*(player.play(host, port, until) for player in players), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    failed = [result for result in results if isinstance(result, Exception)]
+    for error in failed[:3]:
+        print(f"Error in simulated player: {error}")
+    return players, elapsed, len(failed)
+
+def report(players, elapsed, failed):
+    connected = [player for player in players if player.tick_ms is not None]
+    if not connected:
+        print("No player got onto the board")
+        return 1
+    tick_ms = connected[0].tick_ms
+    gaps = sorted(gap for player in connected for gap in player.gaps)
+    jitter = sorted(abs(gap - tick_ms) for gap in gaps)
+    received = sum(player.received for player in connected)
+    print(f"{len(connected)} player(s) connected, {failed} failed, {elapsed:.1f}s, tick {tick_ms} ms")
+    if gaps:
+        print(
+            f"tick gap ms  p50 {percentile(gaps, 50):7.2f}  p99 {percentile(gaps, 99):7.2f}  max {gaps[-1]:7.2f}"
+        )
+        print(f"jitter ms    p50 {percentile(jitter, 50):7.2f}  p99 {percentile(jitter, 99):7.2f}")
+    print(f"ticks out of order or lost {sum(player.missed for player in connected)}")
+    print(f"received {received / len(connected) / elapsed / 1024:8.1f} KiB/s per player")
+    errors = sum(player.errors for player in connected)
+    if any(player.verify for player in connected):
+        print(f"verify errors {errors}")
+    return 1 if errors else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test a Snake server with simulated players")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5555)
+    parser.add_argument("-c", "--clients", type=int, default=100)
+    parser.add_argument("-t", "--seconds", type=float, default=10)
+    parser.add_argument("--turn-chance", type=float, default=0.2, help="chance of a turn after each tick")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verify", action="store_true", help="mirror the board on the first client")
+    args = parser.parse_args(argv)
+    
+    players, elapsed, failed = asyncio.run(
+        run(args.host, args.port, args.clients, args.seconds, args.turn_chance, args.seed, args.verify)
+    )
+    return report(players, elapsed, failed)
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
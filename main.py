@@ -1,11 +1,42 @@
 import tkinter as tk
 from tkinter import messagebox
-import random
 import os
-from PIL import Image, ImageTk
+import random
+import time
+import assets
+import startup
+from autopilot import Autopilot
+from controls import InputQueue
+from engine import SnakeEngine, new_seed
+from events import FOOD_EATEN, GOLDEN_APPLE_EATEN, LEVEL_CHANGED, RESET
+from gameloop import FixedStepLoop
+from particles import PARTICLE_COLORS, ParticleSystem
+from profiler import session_profiler
+from renderer import CanvasRenderer
+from replay import ReplayRecorder
+from scheduler import Scheduler, report as scheduler_report
+from viewport import ViewportRenderer
+
+REPLAY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "replays")
+BOARD_WIDTH = 600
+BOARD_HEIGHT = 600
+UNIT_SIZE = 25
+CHUNK_CELLS = 8
+
+def background_size(large_board):
+    if large_board:
+        return CHUNK_CELLS * UNIT_SIZE, CHUNK_CELLS * UNIT_SIZE
+    return BOARD_WIDTH, BOARD_HEIGHT
+
+def preload_assets():
+    """Decode, resize and compose every image the game needs; safe to run off the Tk thread."""
+    sprite_size = (UNIT_SIZE, UNIT_SIZE)
+    assets.load_sprite("apple.png", sprite_size)
+    assets.load_sprite("golden_apple.png", sprite_size)
+    assets.background_image("grass.png", *background_size(bool(os.environ.get("SNAKE_WORLD"))), UNIT_SIZE)
 
 class SnakeGame:
-    def __init__(self, root, homescreen):
+    def __init__(self, root, homescreen, clicked_at=None):
         self.root = root
         self.homescreen = homescreen
         self.root.title("Snake Game")
@@ -14,24 +45,27 @@ class SnakeGame:
         for widget in self.root.winfo_children():
             widget.destroy()
             
-        self.BOARD_WIDTH = 600
-        self.BOARD_HEIGHT = 600
-        self.UNIT_SIZE = 25
-        self.GAME_SPEED = 120
-        
-        self.snake_body = [[100, 100]]
-        self.direction = "right"
-        self.score = 0
+        self.BOARD_WIDTH = BOARD_WIDTH
+        self.BOARD_HEIGHT = BOARD_HEIGHT
+        self.UNIT_SIZE = UNIT_SIZE
+        
+        # SNAKE_WORLD=COLSxROWS plays on a larger world seen through a scrolling viewport.
+        self.WORLD_WIDTH = self.BOARD_WIDTH
+        self.WORLD_HEIGHT = self.BOARD_HEIGHT
+        self.large_board = bool(os.environ.get("SNAKE_WORLD"))
+        if self.large_board:
+            cols, rows = (int(value) for value in os.environ["SNAKE_WORLD"].lower().split("x"))
+            self.WORLD_WIDTH = cols * self.UNIT_SIZE
+            self.WORLD_HEIGHT = rows * self.UNIT_SIZE
+        
+        self.engine = SnakeEngine(self.WORLD_WIDTH, self.WORLD_HEIGHT, self.UNIT_SIZE, seed=new_seed())
+        self.recorder = ReplayRecorder(self.engine)
+        self.inputs = InputQueue()
+        self.autopilot = Autopilot(self.engine)
+        self.autopilot_enabled = False
         self.game_running = True
-        self.level = 1
-        self.snake_color = "#00FF00"
-        self.particles = []
-        self.golden_apple_position = None
-        self.golden_apple_timer = 0
-        self.rainbow_effect = False
-        self.rainbow_timer = 0
-        
-        self.food_position = self.create_food()
+        self.started_at = time.monotonic()
+        self.particles = ParticleSystem(rng=random.Random())
         
         self.canvas = tk.Canvas(
             self.root,
@@ -42,6 +76,7 @@ class SnakeGame:
             highlightbackground="#FFD700"
         )
         self.canvas.pack()
+        self.scheduler = Scheduler(self.canvas, "game", on_resume=self.resume_loop)
         
         self.load_images()
         
@@ -50,60 +85,65 @@ class SnakeGame:
         self.root.bind('<KeyPress>', self.change_direction)
         self.root.focus_set()
         
-        if self.grass_photo:
-            self.create_grass_background()
-        self.draw_food()
-        self.draw_golden_apple()
-        self.draw_snake()
+        if self.large_board:
+            self.renderer = ViewportRenderer(
+                self.canvas, self.engine, self.BOARD_WIDTH, self.BOARD_HEIGHT,
+                self.background_photo, self.apple_photo, self.golden_apple_photo, CHUNK_CELLS
+            )
+        else:
+            self.renderer = CanvasRenderer(
+                self.canvas, self.engine,
+                self.background_photo, self.apple_photo, self.golden_apple_photo
+            )
         self.update_ui()
-        
-        self.next_turn()
-        
+        self.engine.subscribe(self.on_events, (FOOD_EATEN, GOLDEN_APPLE_EATEN, LEVEL_CHANGED, RESET))
+        self.export = None
+        self.start_export()
+        # Closing the window or going back to the menu destroys the canvas mid-game.
+        self.canvas.bind("<Destroy>", lambda event: self.finish_export(), add="+")
+        
+        self.loop = FixedStepLoop(self.scheduler, self.next_turn, self.draw_frame, lambda: self.engine.game_speed)
+        
+        self.profiler = None
+        self.show_overlay = False
+        if os.environ.get("SNAKE_PROFILE"):
+            self.enable_profiling(os.environ["SNAKE_PROFILE"])
+        
+        self.loop.start()
+        
+        # Startup timing, measured from the START GAME click for the first game only.
+        self.clicked_at = clicked_at
+        if clicked_at is not None:
+            self.root.after_idle(lambda: startup.mark("game_first_frame", clicked_at))
+        
+    def resume_loop(self):
+        # Restart the tick clock after the window was minimized instead of catching up.
+        if self.loop.running:
+            self.loop.start()
+    
     def load_images(self):
         try:
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            grass_path = os.path.join(current_dir, "grass.png")
-            apple_path = os.path.join(current_dir, "apple.png")
-            
-            grass_img = Image.open(grass_path)
-            grass_img = grass_img.resize((self.UNIT_SIZE, self.UNIT_SIZE), Image.Resampling.LANCZOS)
-            self.grass_photo = ImageTk.PhotoImage(grass_img)
-            
-            apple_img = Image.open(apple_path)
-            apple_img = apple_img.resize((self.UNIT_SIZE, self.UNIT_SIZE), Image.Resampling.LANCZOS)
-            self.apple_photo = ImageTk.PhotoImage(apple_img)
-            
-            golden_apple_path = os.path.join(current_dir, "golden_apple.png")
-            golden_apple_img = Image.open(golden_apple_path)
-            golden_apple_img = golden_apple_img.resize((self.UNIT_SIZE, self.UNIT_SIZE), Image.Resampling.LANCZOS)
-            self.golden_apple_photo = ImageTk.PhotoImage(golden_apple_img)
-            
-            self.create_grass_background()
+            sprite_size = (self.UNIT_SIZE, self.UNIT_SIZE)
+            background_width, background_height = background_size(self.large_board)
+            self.background_photo = assets.load_background(
+                self.root, "grass.png", background_width, background_height, self.UNIT_SIZE
+            )
+            self.apple_photo = assets.load_photo(self.root, "apple.png", sprite_size)
+            self.golden_apple_photo = assets.load_photo(self.root, "golden_apple.png", sprite_size)
             
         except Exception as e:
             print(f"Error loading images: {e}")
-            self.grass_photo = None
+            self.background_photo = None
             self.apple_photo = None
             self.golden_apple_photo = None
             
-    def create_grass_background(self):
-        if self.grass_photo:
-            for x in range(0, self.BOARD_WIDTH, self.UNIT_SIZE):
-                for y in range(0, self.BOARD_HEIGHT, self.UNIT_SIZE):
-                    self.canvas.create_image(
-                        x + self.UNIT_SIZE // 2,
-                        y + self.UNIT_SIZE // 2,
-                        image=self.grass_photo,
-                        tags="background"
-                    )
-    
     def create_ui(self):
         ui_frame = tk.Frame(self.root, bg="black")
         ui_frame.pack(fill="x", padx=10, pady=5)
         
         self.score_label = tk.Label(
             ui_frame,
-            text=f"Score: {self.score}",
+            text=f"Score: {self.engine.score}",
             font=("Courier", 16, "bold"),
             fg="#00FF00",
             bg="black"
@@ -112,7 +152,7 @@ class SnakeGame:
         
         self.level_label = tk.Label(
             ui_frame,
-            text=f"Level: {self.level}",
+            text=f"Level: {self.engine.level}",
             font=("Courier", 16, "bold"),
             fg="#FFD700",
             bg="black"
@@ -121,314 +161,172 @@ class SnakeGame:
         
         self.length_label = tk.Label(
             ui_frame,
-            text=f"Length: {len(self.snake_body)}",
+            text=f"Length: {len(self.engine.body)}",
             font=("Courier", 16, "bold"),
             fg="#FF6B6B",
             bg="black"
         )
         self.length_label.pack(side="left", padx=(20, 0))
     
-    def create_food(self):
-        while True:
-            x = random.randint(0, (self.BOARD_WIDTH // self.UNIT_SIZE) - 1) * self.UNIT_SIZE
-            y = random.randint(0, (self.BOARD_HEIGHT // self.UNIT_SIZE) - 1) * self.UNIT_SIZE
-            if [x, y] not in self.snake_body and (self.golden_apple_position is None or [x, y] != self.golden_apple_position):
-                return [x, y]
-    
-    def create_golden_apple(self):
-        while True:
-            x = random.randint(0, (self.BOARD_WIDTH // self.UNIT_SIZE) - 1) * self.UNIT_SIZE
-            y = random.randint(0, (self.BOARD_HEIGHT // self.UNIT_SIZE) - 1) * self.UNIT_SIZE
-            if [x, y] not in self.snake_body and [x, y] != self.food_position:
-                return [x, y]
-    
-    def update_golden_apple_spawn(self):
-        self.golden_apple_timer += 1
-        
-        if self.golden_apple_position is None and self.golden_apple_timer > 100:
-            if random.random() < 0.005:
-                self.golden_apple_position = self.create_golden_apple()
-                self.golden_apple_timer = 0
-        
-        elif self.golden_apple_position is not None:
-            if self.golden_apple_timer > 250:
-                self.golden_apple_position = None
-                self.golden_apple_timer = 0
-    
-    def get_rainbow_color(self, offset=0):
-        import math
-        hue = (self.rainbow_timer + offset) * 0.1
-        r = int((math.sin(hue) + 1) * 127.5)
-        g = int((math.sin(hue + 2.094) + 1) * 127.5)
-        b = int((math.sin(hue + 4.189) + 1) * 127.5)
-        return f"#{r:02x}{g:02x}{b:02x}"
-    
-    def check_collision(self, x, y):
-        if x < 0 or x >= self.BOARD_WIDTH or y < 0 or y >= self.BOARD_HEIGHT:
-            return True
-        
-        for body_part in self.snake_body:
-            if x == body_part[0] and y == body_part[1]:
-                return True
-                
-        return False
-    
-    def check_food(self):
-        x, y = self.snake_body[0]
-        
-        if x == self.food_position[0] and y == self.food_position[1]:
-            self.score += 10
-            self.update_level()
-            self.update_ui()
-            self.create_eat_particles(x, y)
-            self.food_position = self.create_food()
-            return True
-        
-        if self.golden_apple_position and x == self.golden_apple_position[0] and y == self.golden_apple_position[1]:
-            self.score += 50
-            self.update_level()
-            self.update_ui()
-            self.create_golden_eat_particles(x, y)
-            
-            self.rainbow_effect = True
-            self.rainbow_timer = 0
-            
-            self.golden_apple_position = None
-            self.golden_apple_timer = 0
-            
-            self.snake_body.append(self.snake_body[-1].copy())
-            return "golden"
-        
-        return False
-    
-    def update_level(self):
-        new_level = (self.score // 50) + 1
-        if new_level > self.level:
-            self.level = new_level
-            self.GAME_SPEED = max(80, 120 - (self.level * 5))
-            colors = ["#00FF00", "#FFD700", "#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4", "#FFEAA7"]
-            self.snake_color = colors[min(self.level - 1, len(colors) - 1)]
-    
     def update_ui(self):
-        self.score_label.config(text=f"Score: {self.score}")
-        self.level_label.config(text=f"Level: {self.level}")
-        self.length_label.config(text=f"Length: {len(self.snake_body)}")
+        self.score_label.config(text=f"Score: {self.engine.score}")
+        self.level_label.config(text=f"Level: {self.engine.level}")
+        self.length_label.config(text=f"Length: {len(self.engine.body)}")
     
     def create_eat_particles(self, x, y):
-        for _ in range(8):
-            particle = {
-                'x': x + self.UNIT_SIZE // 2,
-                'y': y + self.UNIT_SIZE // 2,
-                'dx': random.randint(-3, 3),
-                'dy': random.randint(-3, 3),
-                'life': 15,
-                'color': '#FFD700'
-            }
-            self.particles.append(particle)
+        self.particles.emit(x + self.UNIT_SIZE // 2, y + self.UNIT_SIZE // 2, 8, speed=3, life=15)
     
     def create_golden_eat_particles(self, x, y):
-        for _ in range(16):
-            particle = {
-                'x': x + self.UNIT_SIZE // 2,
-                'y': y + self.UNIT_SIZE // 2,
-                'dx': random.randint(-5, 5),
-                'dy': random.randint(-5, 5),
-                'life': 25,
-                'color': random.choice(['#FFD700', '#FF6B00', '#FF1493', '#00CED1', '#ADFF2F'])
-            }
-            self.particles.append(particle)
+        self.particles.emit(
+            x + self.UNIT_SIZE // 2, y + self.UNIT_SIZE // 2, 16,
+            speed=5, life=25, colors=range(len(PARTICLE_COLORS))
+        )
     
-    def update_particles(self):
-        self.particles = [p for p in self.particles if p['life'] > 0]
+    def next_turn(self):
+        if not self.game_running:
+            return False
         
-        for particle in self.particles:
-            particle['x'] += particle['dx']
-            particle['y'] += particle['dy']
-            particle['life'] -= 1
-            
-            size = max(1, particle['life'] // 3)
-            self.canvas.create_oval(
-                particle['x'] - size, particle['y'] - size,
-                particle['x'] + size, particle['y'] + size,
-                fill=particle['color'], outline=""
-            )
+        if self.autopilot_enabled:
+            direction = self.autopilot.choose()
+        else:
+            direction = self.inputs.pop(self.engine.direction)
+        if direction is not None:
+            self.engine.change_direction(direction)
+        self.recorder.before_step()
+        self.engine.step()
+        
+        if not self.engine.alive:
+            self.game_over()
+            return False
+        
+        if self.profiler is not None:
+            self.profiler.lap()
+        self.particles.update()
+        if self.profiler is not None:
+            self.profiler.mark("particles")
+        return True
     
-    def next_turn(self):
-        if self.game_running:
-            x, y = self.snake_body[0]
-            
-            if self.direction == "up":
-                y -= self.UNIT_SIZE
-            elif self.direction == "down":
-                y += self.UNIT_SIZE
-            elif self.direction == "left":
-                x -= self.UNIT_SIZE
-            elif self.direction == "right":
-                x += self.UNIT_SIZE
-            
-            if self.check_collision(x, y):
-                self.game_over()
-                return
-            
-            self.snake_body.insert(0, [x, y])
-            
-            food_eaten = self.check_food()
-            if food_eaten == "golden":
-                pass
-                self.snake_body.append(self.snake_body[-1].copy())
-            elif food_eaten:
-                pass
-            else:
-                self.snake_body.pop()
-            
-            self.update_golden_apple_spawn()
-            
-            if self.rainbow_effect:
-                self.rainbow_timer += 1
-                if self.rainbow_timer > 300:
-                    self.rainbow_effect = False
-                    self.rainbow_timer = 0
-            
-            self.canvas.delete("all")
-            
-            if self.grass_photo:
-                self.create_grass_background()
-            
-            self.update_particles()
-            
-            self.draw_food()
-            self.draw_golden_apple()
-            self.draw_snake()
-            
-            self.root.after(self.GAME_SPEED, self.next_turn)
+    def on_events(self, tick, events):
+        # Only score, level and game changes touch the labels; eating also bursts particles.
+        self.update_ui()
+        for kind, cell in events:
+            if kind == FOOD_EATEN:
+                self.create_eat_particles(*self.engine.position_of(cell))
+            elif kind == GOLDEN_APPLE_EATEN:
+                self.create_golden_eat_particles(*self.engine.position_of(cell))
     
-    def draw_food(self):
-        x, y = self.food_position
-        if self.apple_photo:
-            self.canvas.create_oval(
-                x - 2, y - 2, x + self.UNIT_SIZE + 2, y + self.UNIT_SIZE + 2,
-                fill="", outline="#FFD700", width=2
-            )
-            self.canvas.create_image(
-                x + self.UNIT_SIZE // 2,
-                y + self.UNIT_SIZE // 2,
-                image=self.apple_photo
-            )
-        else:
-            self.canvas.create_oval(
-                x - 2, y - 2, x + self.UNIT_SIZE + 2, y + self.UNIT_SIZE + 2,
-                fill="", outline="#FFD700", width=2
-            )
-            self.canvas.create_rectangle(
-                x, y, x + self.UNIT_SIZE, y + self.UNIT_SIZE,
-                fill="#ff3333", outline="#cc0000", width=2
-            )
+    def draw_frame(self):
+        if self.clicked_at is not None:
+            self.root.after_idle(lambda clicked_at=self.clicked_at: startup.mark("game_first_tick", clicked_at))
+            self.clicked_at = None
+        
+        self.renderer.render(self.particles, self.profiler)
+        if self.show_overlay and self.loop.frames % 15 == 0:
+            self.draw_overlay()
     
-    def draw_golden_apple(self):
-        if self.golden_apple_position:
-            x, y = self.golden_apple_position
-            
-            if self.golden_apple_photo:
-                self.canvas.create_oval(
-                    x - 4, y - 4, x + self.UNIT_SIZE + 4, y + self.UNIT_SIZE + 4,
-                    fill="", outline="#FFD700", width=3
-                )
-                self.canvas.create_oval(
-                    x - 2, y - 2, x + self.UNIT_SIZE + 2, y + self.UNIT_SIZE + 2,
-                    fill="", outline="#FFA500", width=2
-                )
-                self.canvas.create_image(
-                    x + self.UNIT_SIZE // 2,
-                    y + self.UNIT_SIZE // 2,
-                    image=self.golden_apple_photo
-                )
-            else:
-                self.canvas.create_oval(
-                    x - 4, y - 4, x + self.UNIT_SIZE + 4, y + self.UNIT_SIZE + 4,
-                    fill="", outline="#FFD700", width=3
-                )
-                self.canvas.create_oval(
-                    x - 2, y - 2, x + self.UNIT_SIZE + 2, y + self.UNIT_SIZE + 2,
-                    fill="", outline="#FFA500", width=2
-                )
-                self.canvas.create_rectangle(
-                    x, y, x + self.UNIT_SIZE, y + self.UNIT_SIZE,
-                    fill="#FFD700", outline="#FFA500", width=2
-                )
+    def enable_profiling(self, dump_path=None):
+        self.profiler = session_profiler(dump_path)
+        self.engine.profiler = self.profiler
+        self.loop.profiler = self.profiler
     
-    def draw_snake(self):
-        for index, (x, y) in enumerate(self.snake_body):
-            if index == 0:
-                head_color = self.get_rainbow_color() if self.rainbow_effect else self.snake_color
-                
-                self.canvas.create_rectangle(
-                    x + 2, y + 2, x + self.UNIT_SIZE - 2, y + self.UNIT_SIZE - 2,
-                    fill=head_color, outline="white", width=2
-                )
-                
-                if self.direction == "right":
-                    eye1_x, eye1_y = x + 18, y + 6
-                    eye2_x, eye2_y = x + 18, y + 18
-                elif self.direction == "left":
-                    eye1_x, eye1_y = x + 7, y + 6
-                    eye2_x, eye2_y = x + 7, y + 18
-                elif self.direction == "up":
-                    eye1_x, eye1_y = x + 6, y + 7
-                    eye2_x, eye2_y = x + 18, y + 7
-                else:
-                    eye1_x, eye1_y = x + 6, y + 18
-                    eye2_x, eye2_y = x + 18, y + 18
-                
-                self.canvas.create_oval(eye1_x, eye1_y, eye1_x + 4, eye1_y + 4, fill="black")
-                self.canvas.create_oval(eye2_x, eye2_y, eye2_x + 4, eye2_y + 4, fill="black")
-            else:
-                if self.rainbow_effect:
-                    body_color = self.get_rainbow_color(index * 10)
-                else:
-                    brightness = max(0.3, 1.0 - (index * 0.05))
-                    body_color = self.adjust_color_brightness(self.snake_color, brightness)
-                
-                self.canvas.create_rectangle(
-                    x + 1, y + 1, x + self.UNIT_SIZE - 1, y + self.UNIT_SIZE - 1,
-                    fill=body_color, outline="#333333", width=1
-                )
-                
-                if index % 2 == 0:
-                    scale_color = "#444444" if not self.rainbow_effect else "#666666"
-                    self.canvas.create_line(
-                        x + 5, y + self.UNIT_SIZE // 2,
-                        x + self.UNIT_SIZE - 5, y + self.UNIT_SIZE // 2,
-                        fill=scale_color, width=1
-                    )
+    def toggle_overlay(self):
+        if self.profiler is None:
+            self.enable_profiling()
+        self.show_overlay = not self.show_overlay
+        if self.show_overlay:
+            self.draw_overlay()
+        else:
+            self.canvas.delete("overlay")
     
-    def adjust_color_brightness(self, color, factor):
-        color = color.lstrip('#')
-        r, g, b = tuple(int(color[i:i+2], 16) for i in (0, 2, 4))
-        r = int(r * factor)
-        g = int(g * factor)
-        b = int(b * factor)
-        return f"#{r:02x}{g:02x}{b:02x}"
+    def draw_overlay(self):
+        fps = 0
+        if len(self.profiler.recent) > 1:
+            frame_ms = sum(sum(row) for row in self.profiler.recent) / len(self.profiler.recent)
+            fps = 1000 / frame_ms if frame_ms else 0
+        text = f"{self.profiler.summary_text()}\nframes/s {fps:5.1f}"
+        latency = self.inputs.latency()
+        if latency:
+            text += f"\ninput ms p50 {latency[0]:5.1f} p95 {latency[1]:5.1f}"
+        decisions = self.autopilot.latency()
+        if self.autopilot_enabled and decisions:
+            text += f"\nautopilot ms p50 {decisions[0]:5.2f} p99 {decisions[2]:5.2f}"
+        timers = scheduler_report().values()
+        text += f"\ntimers {sum(t['active'] for t in timers)} cpu {sum(t['cpu_ms'] for t in timers):8.0f} ms"
+        
+        if not self.canvas.find_withtag("overlay"):
+            self.canvas.create_rectangle(
+                4, 4, 250, 180,
+                fill="black", stipple="gray50", outline="#FFD700", tags=("overlay", "overlay_bg")
+            )
+            self.canvas.create_text(
+                10, 10, anchor="nw", font=("Courier", 9), fill="white", tags=("overlay", "overlay_text")
+            )
+        self.canvas.itemconfig("overlay_text", text=text)
+        self.canvas.tag_raise("overlay")
     
     def change_direction(self, event):
         new_direction = event.keysym.lower()
         
         if new_direction in ['w', 'up']:
-            if self.direction != "down":
-                self.direction = "up"
+            self.inputs.push("up", self.engine.direction)
         elif new_direction in ['s', 'down']:
-            if self.direction != "up":
-                self.direction = "down"
+            self.inputs.push("down", self.engine.direction)
         elif new_direction in ['a', 'left']:
-            if self.direction != "right":
-                self.direction = "left"
+            self.inputs.push("left", self.engine.direction)
         elif new_direction in ['d', 'right']:
-            if self.direction != "left":
-                self.direction = "right"
+            self.inputs.push("right", self.engine.direction)
+        elif new_direction == 'f3':
+            self.toggle_overlay()
+        elif new_direction == 'p':
+            self.toggle_autopilot()
+    
+    def toggle_autopilot(self):
+        self.autopilot_enabled = not self.autopilot_enabled
+        self.autopilot.reset()
+        self.inputs.clear()
+        self.root.title("Snake Game (autopilot)" if self.autopilot_enabled else "Snake Game")
+    
+    def start_export(self):
+        # SNAKE_EXPORT=gif|png|raw also writes every game to exporter.EXPORT_DIR as it is played.
+        fmt = os.environ.get("SNAKE_EXPORT")
+        if not fmt:
+            return
+        import exporter
+        
+        try:
+            os.makedirs(exporter.EXPORT_DIR, exist_ok=True)
+            self.export = exporter.LiveExport(
+                self.engine, fmt.lower(), exporter.export_path(fmt.lower()),
+                view_size=(self.BOARD_WIDTH, self.BOARD_HEIGHT)
+            )
+        except (OSError, ValueError) as e:
+            print(f"Error starting export: {e}")
+    
+    def finish_export(self):
+        if self.export is None:
+            return
+        try:
+            self.export.close()
+        except OSError as e:
+            print(f"Error finishing export: {e}")
+        self.export = None
+    
+    def save_replay(self):
+        replay = self.recorder.finish()
+        try:
+            os.makedirs(REPLAY_DIR, exist_ok=True)
+            replay.save(os.path.join(REPLAY_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{replay.score}.snkr"))
+        except OSError as e:
+            print(f"Error saving replay: {e}")
     
     def game_over(self):
         self.game_running = False
+        self.save_replay()
+        self.finish_export()
         
-        is_new_high_score = self.homescreen.update_high_score(self.score)
+        is_new_high_score = self.homescreen.record_game(
+            self.engine.score, self.engine.level, len(self.engine.body), time.monotonic() - self.started_at
+        )
         
         self.canvas.delete("all")
         
@@ -462,7 +360,7 @@ class SnakeGame:
                 fill="#FFD700"
             )
         
-        stats_text = f"Final Score: {self.score}\nHigh Score: {self.homescreen.high_score}\nLevel Reached: {self.level}\nSnake Length: {len(self.snake_body)}"
+        stats_text = f"Final Score: {self.engine.score}\nHigh Score: {self.homescreen.high_score}\nLevel Reached: {self.engine.level}\nSnake Length: {len(self.engine.body)}"
         self.canvas.create_rectangle(
             120, 340, 480, 440,
             fill="#222222", outline="#FFD700", width=2
@@ -496,36 +394,23 @@ class SnakeGame:
     def return_to_menu(self):
         for widget in self.root.winfo_children():
             widget.destroy()
-        self.homescreen.high_score = self.homescreen.load_high_score()
         self.homescreen.create_widgets()
     
     def restart_game(self):
-        self.snake_body = [[100, 100]]
-        self.food_position = self.create_food()
-        self.direction = "right"
-        self.score = 0
+        self.engine.reset(new_seed())
+        self.recorder.start()
+        self.start_export()
+        self.inputs.clear()
+        self.autopilot.reset()
         self.game_running = True
-        self.level = 1
-        self.snake_color = "#00FF00"
-        self.particles = []
-        self.GAME_SPEED = 120
-        self.golden_apple_position = None
-        self.golden_apple_timer = 0
-        self.rainbow_effect = False
-        self.rainbow_timer = 0
-        
-        self.update_ui()
+        self.started_at = time.monotonic()
+        self.particles.clear()
         
         self.root.bind('<KeyPress>', self.change_direction)
         
-        self.canvas.delete("all")
-        if self.grass_photo:
-            self.create_grass_background()
-        self.draw_food()
-        self.draw_golden_apple()
-        self.draw_snake()
+        self.renderer.reset()
         
-        self.next_turn()
+        self.loop.start()
     
     def run(self):
         self.root.mainloop()
@@ -0,0 +1,162 @@
+"""Offscreen renderer backend.
+
+FrameRenderer draws the same scene as CanvasRenderer into a preallocated PIL
+frame buffer: the composed grass board is blitted in one paste, the apple
+sprites are pasted with their alpha masks and the snake is drawn with
+ImageDraw. It needs neither Tk nor an X server, so it can capture frames,
+make thumbnails and benchmark rendering on a headless machine.
+
+With a ``view_size`` smaller than the board, the frame only covers that much
+of it: a viewport.Camera follows the head as it does in the game, and the
+frame and background are the size of the view, not of the world.
+"""
+from PIL import Image, ImageDraw
+from palette import FADED_INDEX, body_palette, rainbow_color
+from renderer import BODY_OUTLINE, HEAD_OUTLINE, Renderer, eye_offsets
+from viewport import Camera
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BOARD_COLOR = "#1a1a1a"
+
+class FrameRenderer(Renderer):
+    def __init__(self, engine, background=None, apple=None, golden_apple=None, view_size=None, margin=4):
+        self.engine = engine
+        self.unit_size = engine.unit_size
+        self.eye_offsets, self.eye_size = eye_offsets(self.unit_size)
+        size = (engine.board_width, engine.board_height)
+        self.camera = None
+        self.origin = (0, 0)
+        if view_size is not None and (size[0] > view_size[0] or size[1] > view_size[1]):
+            unit = self.unit_size
+            self.camera = Camera(engine.cols, engine.rows, view_size[0] // unit, view_size[1] // unit, margin)
+            size = (self.camera.view_cols * unit, self.camera.view_rows * unit)
+            head_row, head_col = divmod(engine.body.head(), engine.cols)
+            self.camera.center_on(head_col, head_row)
+        if background is None:
+            background = Image.new("RGB", size, BOARD_COLOR)
+        self.background = background.convert("RGB")
+        self.apple = apple
+        self.golden_apple = golden_apple
+        self.frame = Image.new("RGB", size)
+        self.draw = ImageDraw.Draw(self.frame)
+    
+    @classmethod
+    def from_assets(cls, engine, view_size=None):
+        """Build a renderer with the game's sprites, loaded through the sprite cache."""
+        import assets
+        
+        unit = engine.unit_size
+        tile_size = (unit, unit)
+        renderer = cls(
+            engine, None,
+            assets.load_sprite("apple.png", tile_size), assets.load_sprite("golden_apple.png", tile_size), view_size
+        )
+        # The grass repeats every cell and the camera moves in whole cells, so a
+        # background the size of the frame fits wherever the camera is.
+        width, height = renderer.frame.size
+        renderer.background = assets.compose_background(
+            assets.load_sprite("grass.png", tile_size), width, height, unit
+        ).convert("RGB")
+        return renderer
+    
+    def reset(self):
+        self.frame.paste(self.background)
+    
+    def render(self, particles=None, profiler=None):
+        """Draw the current engine state and return the frame buffer (reused between calls)."""
+        if self.camera is not None:
+            self.follow()
+        self.frame.paste(self.background)
+        super().render(particles, profiler)
+        return self.frame
+    
+    def follow(self):
+        """Move the camera with the head; everything is then drawn shifted by ``origin``."""
+        camera = self.camera
+        head_row, head_col = divmod(self.engine.body.head(), self.engine.cols)
+        camera.follow(head_col, head_row)
+        self.origin = (camera.col * self.unit_size, camera.row * self.unit_size)
+    
+    def position_of(self, cell):
+        x, y = self.engine.position_of(cell)
+        return x - self.origin[0], y - self.origin[1]
+    
+    def to_array(self):
+        if np is None:
+            raise RuntimeError("NumPy is required for to_array()")
+        return np.asarray(self.frame)
+    
+    def draw_particles(self, particles):
+        if particles is None:
+            return
+        draw = self.draw
+        origin_x, origin_y = self.origin
+        for x0, y0, x1, y1, color in particles.boxes():
+            draw.ellipse((x0 - origin_x, y0 - origin_y, x1 - origin_x, y1 - origin_y), fill=color)
+    
+    def draw_food(self):
+        if self.engine.food_cell is None:
+            return
+        x, y = self.position_of(self.engine.food_cell)
+        size = self.unit_size
+        self.draw.ellipse((x - 2, y - 2, x + size + 2, y + size + 2), outline="#FFD700", width=2)
+        if self.apple is not None:
+            self.paste_sprite(self.apple, x, y)
+        else:
+            self.draw.rectangle((x, y, x + size, y + size), fill="#ff3333", outline="#cc0000", width=2)
+    
+    def draw_golden_apple(self):
+        if self.engine.golden_apple_cell is None:
+            return
+        x, y = self.position_of(self.engine.golden_apple_cell)
+        size = self.unit_size
+        self.draw.ellipse((x - 4, y - 4, x + size + 4, y + size + 4), outline="#FFD700", width=3)
+        self.draw.ellipse((x - 2, y - 2, x + size + 2, y + size + 2), outline="#FFA500", width=2)
+        if self.golden_apple is not None:
+            self.paste_sprite(self.golden_apple, x, y)
+        else:
+            self.draw.rectangle((x, y, x + size, y + size), fill="#FFD700", outline="#FFA500", width=2)
+    
+    def paste_sprite(self, sprite, x, y):
+        if sprite.mode == "RGBA":
+            self.frame.paste(sprite, (x, y), sprite)
+        else:
+            self.frame.paste(sprite, (x, y))
+    
+    def draw_snake(self):
+        engine = self.engine
+        draw = self.draw
+        size = self.unit_size
+        half = size // 2
+        cols = engine.cols
+        origin_x, origin_y = self.origin
+        width, height = self.frame.size
+        rainbow = engine.rainbow_effect
+        palette = body_palette(engine.snake_color)
+        scale_color = "#666666" if rainbow else "#444444"
+        phase = engine.rainbow_timer
+        
+        for index, cell in enumerate(engine.body):
+            row, col = divmod(cell, cols)
+            x = col * size - origin_x
+            y = row * size - origin_y
+            if index and (x <= -size or y <= -size or x >= width or y >= height):
+                continue
+            color = rainbow_color(phase + index * 10) if rainbow else palette[min(index, FADED_INDEX)]
+            if index == 0:
+                head_x, head_y = x, y
+                draw.rectangle((x + 2, y + 2, x + size - 2, y + size - 2), fill=color, outline=HEAD_OUTLINE, width=2)
+                continue
+            draw.rectangle((x + 1, y + 1, x + size - 1, y + size - 1), fill=color, outline=BODY_OUTLINE, width=1)
+            if index % 2 == 0:
+                draw.line((x + 5, y + half, x + size - 5, y + half), fill=scale_color, width=1)
+        
+        eye_size = self.eye_size
+        for eye_dx, eye_dy in self.eye_offsets[engine.direction]:
+            eye_x = head_x + eye_dx
+            eye_y = head_y + eye_dy
+            draw.ellipse((eye_x, eye_y, eye_x + eye_size, eye_y + eye_size), fill="black")
\ No newline at end of file
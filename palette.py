@@ -0,0 +1,47 @@
+"""Precomputed snake colors.
+
+Body colors only depend on the level color and the segment index, and the
+rainbow effect only on its phase, so both are computed once and looked up.
+"""
+import math
+
+FADED_INDEX = 14
+RAINBOW_SIZE = 1024
+RAINBOW_SCALE = 0.1 * RAINBOW_SIZE / (2 * math.pi)
+
+_body_palettes = {}
+
+def adjust_color_brightness(color, factor):
+    color = color.lstrip('#')
+    r, g, b = tuple(int(color[i:i+2], 16) for i in (0, 2, 4))
+    r = int(r * factor)
+    g = int(g * factor)
+    b = int(b * factor)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+def body_palette(color):
+    """Colors for segment indexes 0..FADED_INDEX; later segments use the last entry."""
+    palette = _body_palettes.get(color)
+    if palette is None:
+        palette = [color]
+        for index in range(1, FADED_INDEX + 1):
+            brightness = max(0.3, 1.0 - (index * 0.05))
+            palette.append(adjust_color_brightness(color, brightness))
+        _body_palettes[color] = palette
+    return palette
+
+def build_rainbow_table():
+    table = []
+    for step in range(RAINBOW_SIZE):
+        hue = step * 2 * math.pi / RAINBOW_SIZE
+        r = int((math.sin(hue) + 1) * 127.5)
+        g = int((math.sin(hue + 2.094) + 1) * 127.5)
+        b = int((math.sin(hue + 4.189) + 1) * 127.5)
+        table.append(f"#{r:02x}{g:02x}{b:02x}")
+    return table
+
+RAINBOW_TABLE = build_rainbow_table()
+
+def rainbow_color(phase):
+    """Rainbow color for ``rainbow_timer + segment_index * 10``."""
+    return RAINBOW_TABLE[int(phase * RAINBOW_SCALE + 0.5) % RAINBOW_SIZE]
@@ -0,0 +1,106 @@
+"""Struct-of-arrays particle system with a fixed capacity.
+
+Particles live in parallel arrays that are advanced in one pass per frame and
+compacted in place, so bursts never allocate per-particle objects. NumPy is
+used when it is installed; otherwise the same arrays are plain array.array
+buffers updated in a Python loop.
+"""
+import random
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+PARTICLE_COLORS = ['#FFD700', '#FF6B00', '#FF1493', '#00CED1', '#ADFF2F']
+
+class ParticleSystem:
+    def __init__(self, capacity=4096, rng=None):
+        self.capacity = capacity
+        self.rng = rng if rng is not None else random
+        if np is not None:
+            self.x = np.zeros(capacity, dtype=np.int32)
+            self.y = np.zeros(capacity, dtype=np.int32)
+            self.dx = np.zeros(capacity, dtype=np.int32)
+            self.dy = np.zeros(capacity, dtype=np.int32)
+            self.life = np.zeros(capacity, dtype=np.int32)
+            self.color = np.zeros(capacity, dtype=np.int8)
+        else:
+            self.x = array('i', bytes(4 * capacity))
+            self.y = array('i', bytes(4 * capacity))
+            self.dx = array('i', bytes(4 * capacity))
+            self.dy = array('i', bytes(4 * capacity))
+            self.life = array('i', bytes(4 * capacity))
+            self.color = array('b', bytes(capacity))
+        self.count = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def clear(self):
+        self.count = 0
+    
+    def emit(self, x, y, amount, speed, life, colors=(0,)):
+        """Add up to ``amount`` particles at (x, y); extra ones are dropped when full."""
+        rng = self.rng
+        amount = min(amount, self.capacity - self.count)
+        for index in range(self.count, self.count + amount):
+            self.x[index] = x
+            self.y[index] = y
+            self.dx[index] = rng.randint(-speed, speed)
+            self.dy[index] = rng.randint(-speed, speed)
+            self.life[index] = life
+            self.color[index] = colors[0] if len(colors) == 1 else rng.choice(colors)
+        self.count += amount
+    
+    def update(self):
+        count = self.count
+        if np is not None:
+            alive = self.life[:count] > 0
+            count = int(np.count_nonzero(alive))
+            if count != self.count:
+                for field in (self.x, self.y, self.dx, self.dy, self.life, self.color):
+                    field[:count] = field[:self.count][alive]
+            self.x[:count] += self.dx[:count]
+            self.y[:count] += self.dy[:count]
+            self.life[:count] -= 1
+            self.count = count
+            return
+        
+        x, y, dx, dy, life, color = self.x, self.y, self.dx, self.dy, self.life, self.color
+        kept = 0
+        for index in range(count):
+            if life[index] > 0:
+                x[kept] = x[index] + dx[index]
+                y[kept] = y[index] + dy[index]
+                dx[kept] = dx[index]
+                dy[kept] = dy[index]
+                life[kept] = life[index] - 1
+                color[kept] = color[index]
+                kept += 1
+        self.count = kept
+    
+    def boxes(self, limit=None):
+        """Yield (x0, y0, x1, y1, color) for at most ``limit`` live particles."""
+        count = self.count if limit is None else min(self.count, limit)
+        if np is not None:
+            size = np.maximum(1, self.life[:count] // 3)
+            x = self.x[:count]
+            y = self.y[:count]
+            return zip(
+                (x - size).tolist(), (y - size).tolist(),
+                (x + size).tolist(), (y + size).tolist(),
+                [PARTICLE_COLORS[c] for c in self.color[:count].tolist()]
+            )
+        return self.iter_boxes(count)
+    
+    def iter_boxes(self, count):
+        x, y, life, color = self.x, self.y, self.life, self.color
+        for index in range(count):
+            size = max(1, life[index] // 3)
+            yield (
+                x[index] - size, y[index] - size,
+                x[index] + size, y[index] + size,
+                PARTICLE_COLORS[color[index]]
+            )
\ No newline at end of file
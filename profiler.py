@@ -0,0 +1,121 @@
+"""Per-phase frame timing.
+
+A frame is one wake-up of the game loop: the ticks it runs plus the render
+that follows. Code under measurement calls lap() to start a stopwatch and
+mark(phase) to charge the time since the last lap/mark to that phase. Tk idle
+time is the gap between the end of one frame and the start of the next,
+which is where Tk repaints the canvas and handles input.
+"""
+import atexit
+import csv
+import json
+import time
+from collections import deque
+
+PHASES = (
+    "movement",
+    "collision",
+    "food",
+    "golden_apple",
+    "particles",
+    "draw_particles",
+    "draw_sprites",
+    "tk_idle"
+)
+
+def percentile(values, p):
+    """Nearest-rank ``p``th percentile of ``values``, which must be sorted and not empty."""
+    return values[min(len(values) - 1, len(values) * p // 100)]
+
+def percentiles(values, points=(50, 95, 99)):
+    """Nearest-rank percentiles of ``values`` in any order; an empty list when there are none."""
+    if not values:
+        return []
+    values = sorted(values)
+    return [percentile(values, p) for p in points]
+
+class FrameProfiler:
+    def __init__(self, window=240, clock=time.perf_counter):
+        self.window = window
+        self.clock = clock
+        self.recent = deque(maxlen=window)
+        self.history = []
+        self.current = None
+        self.frame_ticks = 0
+        self.last = 0.0
+        self.frame_end = None
+    
+    def begin_frame(self):
+        now = self.clock()
+        self.current = dict.fromkeys(PHASES, 0.0)
+        if self.frame_end is not None:
+            self.current["tk_idle"] = now - self.frame_end
+        self.frame_ticks = 0
+        self.last = now
+    
+    def end_frame(self):
+        if self.current is None:
+            return
+        if self.frame_ticks:
+            self.frame_end = self.clock()
+            row = [self.current[phase] * 1000 for phase in PHASES]
+            self.recent.append(row)
+            self.history.append((self.frame_ticks, row))
+        self.current = None
+    
+    def skip_idle(self):
+        self.frame_end = None
+    
+    def count_tick(self):
+        self.frame_ticks += 1
+    
+    def lap(self):
+        self.last = self.clock()
+    
+    def mark(self, phase):
+        now = self.clock()
+        if self.current is not None:
+            self.current[phase] += now - self.last
+        self.last = now
+    
+    def percentiles(self, points=(50, 95, 99)):
+        """Return {phase: [p50, p95, p99]} in milliseconds over the rolling window."""
+        result = {}
+        if not self.recent:
+            return result
+        for column, phase in enumerate(PHASES):
+            result[phase] = percentiles([row[column] for row in self.recent], points)
+        return result
+    
+    def summary_text(self):
+        lines = ["phase             p50    p95 ms"]
+        for phase, (p50, p95, _) in self.percentiles().items():
+            lines.append(f"{phase:<15}{p50:6.2f} {p95:6.2f}")
+        return "\n".join(lines)
+    
+    def dump(self, path):
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({
+                    "phases": PHASES,
+                    "units": "ms",
+                    "frames": [{"ticks": ticks, **dict(zip(PHASES, row))} for ticks, row in self.history],
+                    "percentiles": self.percentiles()
+                }, f, indent=1)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(("frame", "ticks") + PHASES)
+                for frame, (ticks, row) in enumerate(self.history):
+                    writer.writerow([frame, ticks] + [f"{value:.4f}" for value in row])
+
+_session = None
+
+def session_profiler(dump_path=None):
+    """Process-wide profiler shared by every game, dumped to ``dump_path`` at exit."""
+    global _session
+    if _session is None:
+        _session = FrameProfiler()
+        if dump_path:
+            atexit.register(_session.dump, dump_path)
+    return _session
\ No newline at end of file
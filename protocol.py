@@ -0,0 +1,221 @@
+"""Wire format between server.py and its clients.
+
+Server to client, every message is a varint length followed by that many
+bytes, the first of which is the message type:
+
+WELCOME   player snake id, board columns and rows, tick length in ms
+SNAPSHOT  the whole board: tick, every snake (id, direction, score, cells),
+          and the food cells. Sent once, when a client joins.
+DELTA     what one tick changed (see world.Delta): the ids of snakes that
+          left, spawned snakes with their cells, one entry per snake that
+          moved, the ids of snakes that died, then food cells removed and
+          added.
+
+Every move is one head step from the previous head, so a move costs a
+snake-id gap (moves are sorted by id) plus one byte holding the direction
+code and whether the snake grew. Whether a tail dropped follows from that
+flag, so a tick of a hundred snakes is a couple of hundred bytes.
+
+Client to server, every byte is a direction code (see replay.DIRECTION_NAMES)
+for the player's next turn.
+
+BoardState replays these messages into a copy of the board.
+"""
+from collections import deque
+from engine import DIRECTIONS
+from replay import DIRECTION_CODES, DIRECTION_NAMES, ReplayError, read_varint, write_varint
+from world import FOOD_SCORE, Delta
+
+WELCOME = 0
+SNAPSHOT = 1
+DELTA = 2
+
+def frame(payload):
+    out = bytearray()
+    write_varint(out, len(payload))
+    out += payload
+    return bytes(out)
+
+class FrameDecoder:
+    """Splits a byte stream back into message payloads."""
+    
+    def __init__(self):
+        self.buffer = bytearray()
+    
+    def feed(self, data):
+        buffer = self.buffer
+        buffer += data
+        payloads = []
+        pos = 0
+        while True:
+            try:
+                length, start = read_varint(buffer, pos)
+            except ReplayError:
+                break
+            if start + length > len(buffer):
+                break
+            payloads.append(bytes(buffer[start:start + length]))
+            pos = start + length
+        del buffer[:pos]
+        return payloads
+
+def write_cells(out, cells):
+    write_varint(out, len(cells))
+    for cell in cells:
+        write_varint(out, cell)
+
+def read_cells(data, pos):
+    count, pos = read_varint(data, pos)
+    cells = []
+    for _ in range(count):
+        cell, pos = read_varint(data, pos)
+        cells.append(cell)
+    return cells, pos
+
+def encode_welcome(snake_id, cols, rows, tick_ms):
+    out = bytearray([WELCOME])
+    for value in (snake_id, cols, rows, tick_ms):
+        write_varint(out, value)
+    return bytes(out)
+
+def decode_welcome(data):
+    values = []
+    pos = 1
+    for _ in range(4):
+        value, pos = read_varint(data, pos)
+        values.append(value)
+    return values
+
+def encode_snapshot(world):
+    out = bytearray([SNAPSHOT])
+    write_varint(out, world.tick)
+    snakes = [snake for snake in world.snakes.values() if snake.alive]
+    write_varint(out, len(snakes))
+    for snake in snakes:
+        write_varint(out, snake.id)
+        write_varint(out, DIRECTION_CODES[snake.direction])
+        write_varint(out, snake.score)
+        write_cells(out, list(snake.body))
+    write_cells(out, sorted(world.food))
+    return bytes(out)
+
+def decode_snapshot(data):
+    """(tick, [(snake id, direction code, score, cells)], food cells)"""
+    tick, pos = read_varint(data, 1)
+    count, pos = read_varint(data, pos)
+    snakes = []
+    for _ in range(count):
+        snake_id, pos = read_varint(data, pos)
+        code, pos = read_varint(data, pos)
+        score, pos = read_varint(data, pos)
+        cells, pos = read_cells(data, pos)
+        snakes.append((snake_id, code, score, cells))
+    food, pos = read_cells(data, pos)
+    return tick, snakes, food
+
+def encode_delta(delta):
+    out = bytearray([DELTA])
+    write_varint(out, delta.tick)
+    write_cells(out, delta.left)
+    write_varint(out, len(delta.spawned))
+    for snake_id, code, cells in delta.spawned:
+        write_varint(out, snake_id)
+        write_varint(out, code)
+        write_cells(out, cells)
+    
+    write_varint(out, len(delta.moves))
+    previous = 0
+    for snake_id, code, grew in sorted(delta.moves):
+        write_varint(out, snake_id - previous)
+        out.append(code | grew << 2)
+        previous = snake_id
+    
+    write_cells(out, delta.died)
+    write_cells(out, delta.food_removed)
+    write_cells(out, delta.food_added)
+    return bytes(out)
+
+def decode_delta(data):
+    tick, pos = read_varint(data, 1)
+    delta = Delta(tick)
+    delta.left, pos = read_cells(data, pos)
+    count, pos = read_varint(data, pos)
+    for _ in range(count):
+        snake_id, pos = read_varint(data, pos)
+        code, pos = read_varint(data, pos)
+        cells, pos = read_cells(data, pos)
+        delta.spawned.append((snake_id, code, cells))
+    
+    count, pos = read_varint(data, pos)
+    snake_id = 0
+    for _ in range(count):
+        gap, pos = read_varint(data, pos)
+        snake_id += gap
+        byte = data[pos]
+        pos += 1
+        delta.moves.append((snake_id, byte & 3, bool(byte & 4)))
+    
+    delta.died, pos = read_cells(data, pos)
+    delta.food_removed, pos = read_cells(data, pos)
+    delta.food_added, pos = read_cells(data, pos)
+    return delta
+
+class RemoteSnake:
+    def __init__(self, snake_id, code, score, cells):
+        self.id = snake_id
+        self.direction = DIRECTION_NAMES[code]
+        self.score = score
+        self.body = deque(cells)
+
+class BoardState:
+    """A client's copy of the board, kept current from SNAPSHOT and DELTA messages."""
+    
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.tick = 0
+        self.snakes = {}
+        self.food = set()
+    
+    def apply_snapshot(self, data):
+        self.tick, snakes, food = decode_snapshot(data)
+        self.snakes = {snake_id: RemoteSnake(snake_id, code, score, cells) for snake_id, code, score, cells in snakes}
+        self.food = set(food)
+    
+    def apply_delta(self, delta):
+        """Apply a decoded delta.
+
+        Returns the snake cells it changed, in order, as (snake id, cell,
+        occupied) triples: a cell can be freed and taken again in one tick.
+        """
+        changes = []
+        self.tick = delta.tick
+        snakes = self.snakes
+        self.remove_snakes(delta.left, changes)
+        for snake_id, code, cells in delta.spawned:
+            snakes[snake_id] = RemoteSnake(snake_id, code, 0, cells)
+            changes.extend((snake_id, cell, True) for cell in cells)
+        
+        cols = self.cols
+        for snake_id, code, grew in delta.moves:
+            snake = snakes[snake_id]
+            snake.direction = DIRECTION_NAMES[code]
+            dx, dy = DIRECTIONS[snake.direction]
+            head = snake.body[0] + dy * cols + dx
+            snake.body.appendleft(head)
+            changes.append((snake_id, head, True))
+            if grew:
+                snake.score += FOOD_SCORE
+            else:
+                changes.append((snake_id, snake.body.pop(), False))
+        self.remove_snakes(delta.died, changes)
+        
+        self.food.difference_update(delta.food_removed)
+        self.food.update(delta.food_added)
+        return changes
+    
+    def remove_snakes(self, snake_ids, changes):
+        for snake_id in snake_ids:
+            snake = self.snakes.pop(snake_id, None)
+            if snake is not None:
+                changes.extend((snake_id, cell, False) for cell in snake.body)
\ No newline at end of file
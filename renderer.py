@@ -0,0 +1,355 @@
+"""Renderers for SnakeEngine.
+
+Renderer is the interface shared by every backend: reset() when a game
+starts, then render() once per frame. CanvasRenderer draws on a Tk canvas;
+offscreen.FrameRenderer rasterizes the same scene into a PIL frame buffer.
+
+CanvasRenderer is retained-mode. Canvas items are created once and then moved, recolored or recycled as the
+engine changes, instead of deleting and recreating the whole scene each tick.
+Snake segment colors and scale stripes depend on the segment index, so every
+segment carries a sequence number; its index is ``head_seq - seq``.
+"""
+from abc import ABC, abstractmethod
+from collections import deque
+from palette import FADED_INDEX, body_palette, rainbow_color
+
+HEAD_OUTLINE = "white"
+BODY_OUTLINE = "#333333"
+MAX_PARTICLE_ITEMS = 512
+EYE_CELL_SIZE = 25
+EYE_SIZE = 4
+EYE_OFFSETS = {
+    "right": ((18, 6), (18, 18)),
+    "left": ((7, 6), (7, 18)),
+    "up": ((6, 7), (18, 7)),
+    "down": ((6, 18), (18, 18))
+}
+
+def eye_offsets(unit_size):
+    """EYE_OFFSETS and the eye diameter, scaled from the 25-pixel cells they were drawn for."""
+    if unit_size == EYE_CELL_SIZE:
+        return EYE_OFFSETS, EYE_SIZE
+    offsets = {
+        direction: tuple((dx * unit_size // EYE_CELL_SIZE, dy * unit_size // EYE_CELL_SIZE) for dx, dy in eyes)
+        for direction, eyes in EYE_OFFSETS.items()
+    }
+    return offsets, max(2, EYE_SIZE * unit_size // EYE_CELL_SIZE)
+
+class Renderer(ABC):
+    @abstractmethod
+    def reset(self):
+        pass
+    
+    def render(self, particles=None, profiler=None):
+        """Draw one frame; with a profiler, charge particles and sprites to their phases."""
+        if profiler is not None:
+            profiler.lap()
+        self.draw_particles(particles)
+        if profiler is not None:
+            profiler.mark("draw_particles")
+        self.draw_food()
+        self.draw_golden_apple()
+        self.draw_snake()
+        if profiler is not None:
+            profiler.mark("draw_sprites")
+    
+    @abstractmethod
+    def draw_particles(self, particles):
+        pass
+    
+    @abstractmethod
+    def draw_food(self):
+        pass
+    
+    @abstractmethod
+    def draw_golden_apple(self):
+        pass
+    
+    @abstractmethod
+    def draw_snake(self):
+        pass
+
+class CanvasRenderer(Renderer):
+    def __init__(self, canvas, engine, background_photo=None, apple_photo=None, golden_apple_photo=None, tag=None):
+        self.canvas = canvas
+        self.engine = engine
+        # With a ``tag``, item tags are prefixed with it and every item also
+        # carries it, so several renderers can share one canvas.
+        self.tag = tag
+        self.prefix = "" if tag is None else f"{tag}:"
+        self.unit_size = engine.unit_size
+        self.eye_offsets, self.eye_size = eye_offsets(self.unit_size)
+        self.background_photo = background_photo
+        self.apple_photo = apple_photo
+        self.golden_apple_photo = golden_apple_photo
+        
+        self.reset()
+    
+    def reset(self):
+        self.canvas.delete("all" if self.tag is None else self.tag)
+        
+        self.segments = deque()
+        self.spare_segments = []
+        self.head_seq = 0
+        self.head_segment = None
+        self.synced_ticks = self.engine.ticks
+        self.body_color = None
+        self.rainbow_drawn = False
+        self.scale_rainbow = None
+        
+        self.particle_items = []
+        self.particle_colors = []
+        self.visible_particles = 0
+        
+        self.food_cell = None
+        self.golden_apple_cell = None
+        
+        self.draw_background()
+        self.create_food_items()
+        self.create_golden_apple_items()
+        self.eyes = (
+            self.canvas.create_oval(0, 0, 0, 0, fill="black", tags=self.tags("eyes")),
+            self.canvas.create_oval(0, 0, 0, 0, fill="black", tags=self.tags("eyes"))
+        )
+        
+        self.render()
+    
+    def tags(self, *names):
+        """Item tags for ``names`` in this renderer's namespace."""
+        tags = tuple(self.prefix + name for name in names)
+        return tags if self.tag is None else tags + (self.tag,)
+    
+    def draw_background(self):
+        if self.background_photo is None:
+            return
+        
+        self.canvas.create_image(0, 0, image=self.background_photo, anchor="nw", tags=self.tags("background"))
+        self.canvas.tag_lower(self.prefix + "background")
+    
+    def create_food_items(self):
+        self.food_ring = self.canvas.create_oval(
+            0, 0, 0, 0, fill="", outline="#FFD700", width=2, state="hidden", tags=self.tags("food")
+        )
+        if self.apple_photo:
+            self.food_sprite = self.canvas.create_image(
+                0, 0, image=self.apple_photo, state="hidden", tags=self.tags("food")
+            )
+        else:
+            self.food_sprite = self.canvas.create_rectangle(
+                0, 0, 0, 0, fill="#ff3333", outline="#cc0000", width=2, state="hidden", tags=self.tags("food")
+            )
+    
+    def create_golden_apple_items(self):
+        self.golden_outer_ring = self.canvas.create_oval(
+            0, 0, 0, 0, fill="", outline="#FFD700", width=3, state="hidden", tags=self.tags("golden_apple")
+        )
+        self.golden_inner_ring = self.canvas.create_oval(
+            0, 0, 0, 0, fill="", outline="#FFA500", width=2, state="hidden", tags=self.tags("golden_apple")
+        )
+        if self.golden_apple_photo:
+            self.golden_sprite = self.canvas.create_image(
+                0, 0, image=self.golden_apple_photo, state="hidden", tags=self.tags("golden_apple")
+            )
+        else:
+            self.golden_sprite = self.canvas.create_rectangle(
+                0, 0, 0, 0, fill="#FFD700", outline="#FFA500", width=2, state="hidden", tags=self.tags("golden_apple")
+            )
+    
+    def draw_food(self):
+        cell = self.engine.food_cell
+        if cell == self.food_cell:
+            return
+        self.food_cell = cell
+        
+        self.show_food(None if cell is None else self.engine.position_of(cell))
+    
+    def show_food(self, position):
+        if position is None:
+            self.canvas.itemconfig(self.prefix + "food", state="hidden")
+            return
+        
+        x, y = position
+        size = self.unit_size
+        self.canvas.coords(self.food_ring, x - 2, y - 2, x + size + 2, y + size + 2)
+        if self.apple_photo:
+            self.canvas.coords(self.food_sprite, x + size // 2, y + size // 2)
+        else:
+            self.canvas.coords(self.food_sprite, x, y, x + size, y + size)
+        self.canvas.itemconfig(self.prefix + "food", state="normal")
+    
+    def draw_golden_apple(self):
+        cell = self.engine.golden_apple_cell
+        if cell == self.golden_apple_cell:
+            return
+        self.golden_apple_cell = cell
+        
+        self.show_golden_apple(None if cell is None else self.engine.position_of(cell))
+    
+    def show_golden_apple(self, position):
+        if position is None:
+            self.canvas.itemconfig(self.prefix + "golden_apple", state="hidden")
+            return
+        
+        x, y = position
+        size = self.unit_size
+        self.canvas.coords(self.golden_outer_ring, x - 4, y - 4, x + size + 4, y + size + 4)
+        self.canvas.coords(self.golden_inner_ring, x - 2, y - 2, x + size + 2, y + size + 2)
+        if self.golden_apple_photo:
+            self.canvas.coords(self.golden_sprite, x + size // 2, y + size // 2)
+        else:
+            self.canvas.coords(self.golden_sprite, x, y, x + size, y + size)
+        self.canvas.itemconfig(self.prefix + "golden_apple", state="normal")
+    
+    def draw_particles(self, particles):
+        count = 0
+        if particles is not None:
+            for x0, y0, x1, y1, color in self.particle_boxes(particles):
+                if count == len(self.particle_items):
+                    item = self.canvas.create_oval(0, 0, 0, 0, outline="", tags=self.tags("particle"))
+                    self.canvas.tag_lower(item, self.prefix + "food")
+                    self.particle_items.append(item)
+                    self.particle_colors.append(None)
+                item = self.particle_items[count]
+                
+                self.canvas.coords(item, x0, y0, x1, y1)
+                if self.particle_colors[count] != color or count >= self.visible_particles:
+                    self.canvas.itemconfig(item, fill=color, state="normal")
+                    self.particle_colors[count] = color
+                count += 1
+        
+        for index in range(count, self.visible_particles):
+            self.canvas.itemconfig(self.particle_items[index], state="hidden")
+        self.visible_particles = count
+    
+    def particle_boxes(self, particles):
+        return particles.boxes(MAX_PARTICLE_ITEMS)
+    
+    def draw_snake(self):
+        engine = self.engine
+        body = engine.body
+        segments = self.segments
+        
+        new_heads = min(engine.ticks - self.synced_ticks, len(body))
+        if not segments or new_heads < 0:
+            new_heads = len(body)
+        self.synced_ticks = engine.ticks
+        keep = len(body) - new_heads
+        
+        spare_base = len(self.spare_segments)
+        while len(segments) > keep:
+            self.spare_segments.append(segments.pop())
+        
+        for index in range(max(0, len(segments) - 2), len(segments)):
+            cell = body[index + new_heads]
+            if segments[index][3] != cell:
+                self.move_segment(segments[index], cell)
+        
+        grown_from = len(segments)
+        while len(segments) < keep:
+            seq = segments[-1][2] - 1 if segments else self.head_seq
+            segments.append(self.place_segment(body[len(segments) + new_heads], seq))
+        
+        for index in range(new_heads - 1, -1, -1):
+            if segments:
+                self.head_seq += 1
+            segments.appendleft(self.place_segment(body[index], self.head_seq))
+        
+        for segment in self.spare_segments[spare_base:]:
+            self.canvas.itemconfig(segment[0], state="hidden")
+            self.canvas.itemconfig(segment[1], state="hidden", tags=self.tags())
+        
+        self.style_head()
+        self.color_segments(new_heads, grown_from + new_heads)
+        self.draw_scales()
+        self.draw_eyes()
+    
+    def place_segment(self, cell, seq):
+        if self.spare_segments:
+            segment = self.spare_segments.pop()
+            if segment is self.head_segment:
+                self.canvas.itemconfig(segment[0], outline=BODY_OUTLINE, width=1)
+                self.head_segment = None
+            self.canvas.itemconfig(segment[0], state="normal")
+        else:
+            rect = self.canvas.create_rectangle(0, 0, 0, 0, outline=BODY_OUTLINE, width=1, tags=self.tags("snake"))
+            line = self.canvas.create_line(0, 0, 0, 0, width=1, tags=self.tags("scale"))
+            self.canvas.tag_raise(self.prefix + "eyes")
+            segment = [rect, line, seq, cell]
+        
+        self.canvas.itemconfig(
+            segment[1], state="normal", fill=self.scale_color(), tags=self.tags("scale", f"scale{seq % 2}")
+        )
+        segment[2] = seq
+        self.move_segment(segment, cell)
+        return segment
+    
+    def move_segment(self, segment, cell):
+        x, y = self.engine.position_of(cell)
+        size = self.unit_size
+        self.canvas.coords(segment[0], x + 1, y + 1, x + size - 1, y + size - 1)
+        self.canvas.coords(segment[1], x + 5, y + size // 2, x + size - 5, y + size // 2)
+        segment[3] = cell
+    
+    def style_head(self):
+        head = self.segments[0]
+        if head is self.head_segment:
+            return
+        
+        size = self.unit_size
+        old_head = self.head_segment
+        if old_head is not None:
+            x, y = self.engine.position_of(old_head[3])
+            self.canvas.coords(old_head[0], x + 1, y + 1, x + size - 1, y + size - 1)
+            self.canvas.itemconfig(old_head[0], outline=BODY_OUTLINE, width=1)
+        
+        x, y = self.engine.position_of(head[3])
+        self.canvas.coords(head[0], x + 2, y + 2, x + size - 2, y + size - 2)
+        self.canvas.itemconfig(head[0], outline=HEAD_OUTLINE, width=2)
+        self.head_segment = head
+    
+    def color_segments(self, new_heads, first_new_tail):
+        engine = self.engine
+        canvas = self.canvas
+        if engine.rainbow_effect:
+            phase = engine.rainbow_timer
+            for segment in self.segments:
+                canvas.itemconfig(segment[0], fill=rainbow_color(phase))
+                phase += 10
+            self.rainbow_drawn = True
+            return
+        
+        if self.rainbow_drawn or self.body_color != engine.snake_color:
+            recolor = len(self.segments)
+        else:
+            recolor = min(len(self.segments), FADED_INDEX + 1 + new_heads)
+        self.rainbow_drawn = False
+        self.body_color = engine.snake_color
+        
+        palette = body_palette(engine.snake_color)
+        for index in range(recolor):
+            canvas.itemconfig(self.segments[index][0], fill=palette[min(index, FADED_INDEX)])
+        for index in range(max(recolor, first_new_tail), len(self.segments)):
+            canvas.itemconfig(self.segments[index][0], fill=palette[FADED_INDEX])
+    
+    def draw_scales(self):
+        parity = self.head_seq % 2
+        rainbow = self.engine.rainbow_effect
+        if rainbow != self.scale_rainbow:
+            self.canvas.itemconfig(self.prefix + "scale", fill=self.scale_color())
+            self.scale_rainbow = rainbow
+        self.canvas.itemconfig(f"{self.prefix}scale{parity}", state="normal")
+        self.canvas.itemconfig(f"{self.prefix}scale{1 - parity}", state="hidden")
+        self.canvas.itemconfig(self.segments[0][1], state="hidden")
+    
+    def scale_color(self):
+        return "#444444" if not self.engine.rainbow_effect else "#666666"
+    
+    def draw_eyes(self):
+        x, y = self.engine.position_of(self.segments[0][3])
+        (eye1_dx, eye1_dy), (eye2_dx, eye2_dy) = self.eye_offsets[self.engine.direction]
+        eye1_x, eye1_y = x + eye1_dx, y + eye1_dy
+        eye2_x, eye2_y = x + eye2_dx, y + eye2_dy
+        size = self.eye_size
+        
+        self.canvas.coords(self.eyes[0], eye1_x, eye1_y, eye1_x + size, eye1_y + size)
+        self.canvas.coords(self.eyes[1], eye2_x, eye2_y, eye2_x + size, eye2_y + size)
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""Per-screen ownership of Tk after() callbacks.
+
+Every screen creates a Scheduler for its main widget and schedules all of its
+timers through it. When that widget is destroyed, all of its timers are
+cancelled, so a screen that is torn down cannot leave callbacks running
+behind it. While the window is unmapped (minimized), the timers are
+suspended and then re-armed when it is mapped again. Each timer counts its
+calls and the process CPU time its callback used; report() sums those
+figures for every live scheduler.
+
+Scheduler.after() and after_cancel() have the same signatures as the Tk
+methods, so a Scheduler can stand in for the root wherever code only needs
+those two calls.
+"""
+import time
+import tkinter as tk
+import weakref
+
+_schedulers = weakref.WeakSet()
+
+class Timer:
+    def __init__(self, key, callback, delay, repeat, name):
+        self.key = key
+        self.callback = callback
+        self.delay = delay
+        self.repeat = repeat
+        self.name = name
+        self.after_id = None
+        self.calls = 0
+        self.cpu_time = 0.0
+
+class Scheduler:
+    def __init__(self, widget, name="", on_resume=None):
+        self.widget = widget
+        self.name = name
+        self.on_resume = on_resume
+        self.timers = {}
+        self.next_key = 0
+        self.paused = False
+        self.closed = False
+        self.finished_calls = 0
+        self.finished_cpu_time = 0.0
+        
+        # A bindtag of our own on the toplevel sees its Map/Unmap events without
+        # touching other bindings, and is simply dropped again in close().
+        self.toplevel = widget.winfo_toplevel()
+        self.tag = f"scheduler{id(self)}"
+        self.toplevel.bindtags((self.tag,) + self.toplevel.bindtags())
+        widget.bind_class(self.tag, "<Unmap>", lambda event: self.pause())
+        widget.bind_class(self.tag, "<Map>", lambda event: self.resume())
+        widget.bind("<Destroy>", self.on_destroy, add="+")
+        _schedulers.add(self)
+    
+    def after(self, delay, callback, name=None):
+        """Run ``callback`` once after ``delay`` ms; returns a key for after_cancel()."""
+        return self.add(callback, delay, False, name)
+    
+    def every(self, interval, callback, name=None):
+        """Run ``callback`` every ``interval`` ms until cancelled."""
+        return self.add(callback, interval, True, name)
+    
+    def add(self, callback, delay, repeat, name):
+        if self.closed:
+            return None
+        key = self.next_key
+        self.next_key += 1
+        timer = Timer(key, callback, delay, repeat, name or getattr(callback, "__name__", "timer"))
+        self.timers[key] = timer
+        if not self.paused:
+            self.arm(timer)
+        return key
+    
+    def arm(self, timer):
+        timer.after_id = self.widget.after(timer.delay, lambda: self.run(timer))
+    
+    def run(self, timer):
+        timer.after_id = None
+        if not timer.repeat:
+            self.retire(timer)
+        start = time.process_time()
+        try:
+            timer.callback()
+        finally:
+            elapsed = time.process_time() - start
+            timer.calls += 1
+            timer.cpu_time += elapsed
+            if timer.key not in self.timers:
+                self.finished_calls += 1
+                self.finished_cpu_time += elapsed
+        if timer.repeat and timer.key in self.timers and not self.paused and not self.closed:
+            self.arm(timer)
+    
+    def after_cancel(self, key):
+        timer = self.timers.get(key)
+        if timer is None:
+            return
+        if timer.after_id is not None:
+            self.widget.after_cancel(timer.after_id)
+            timer.after_id = None
+        self.retire(timer)
+    
+    def retire(self, timer):
+        if self.timers.pop(timer.key, None) is not None:
+            self.finished_calls += timer.calls
+            self.finished_cpu_time += timer.cpu_time
+    
+    def pause(self):
+        if self.paused:
+            return
+        self.paused = True
+        for timer in self.timers.values():
+            if timer.after_id is not None:
+                self.widget.after_cancel(timer.after_id)
+                timer.after_id = None
+    
+    def resume(self):
+        if not self.paused or self.closed:
+            return
+        self.paused = False
+        for timer in list(self.timers.values()):
+            self.arm(timer)
+        if self.on_resume is not None:
+            self.on_resume()
+    
+    def on_destroy(self, event):
+        if event.widget is self.widget:
+            self.close()
+    
+    def close(self):
+        if self.closed:
+            return
+        for key in list(self.timers):
+            self.after_cancel(key)
+        self.closed = True
+        _schedulers.discard(self)
+        try:
+            self.toplevel.bindtags(tuple(tag for tag in self.toplevel.bindtags() if tag != self.tag))
+            self.toplevel.unbind_class(self.tag, "<Unmap>")
+            self.toplevel.unbind_class(self.tag, "<Map>")
+        except tk.TclError:
+            pass
+    
+    def stats(self):
+        """Active timers, total callback calls and CPU milliseconds, finished timers included."""
+        timers = self.timers.values()
+        return {
+            "active": len(self.timers),
+            "calls": self.finished_calls + sum(timer.calls for timer in timers),
+            "cpu_ms": (self.finished_cpu_time + sum(timer.cpu_time for timer in timers)) * 1000
+        }
+
+def report():
+    """Return {scheduler name: stats()} for every scheduler that is still open."""
+    return {scheduler.name or scheduler.tag: scheduler.stats() for scheduler in list(_schedulers)}
\ No newline at end of file
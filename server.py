@@ -0,0 +1,164 @@
+"""Multiplayer server: one shared board, many players, authoritative ticks.
+
+    python server.py --board 64x64 --tick-ms 100 --port 5555
+    python client.py --host 127.0.0.1 --port 5555        # a player
+    python loadtest.py --clients 300                       # simulated players
+    python server.py --board 256x256 --bots 400            # players among AI snakes
+
+Each connection gets a snake on the board. Clients only send turns. The
+server steps the World at a fixed rate and sends every client the same
+encoded Delta of the tick, so encoding costs the same for one client as for
+a thousand. A client that falls so far behind that its send buffer passes
+MAX_BUFFERED bytes is disconnected instead of holding memory for it.
+
+Ticks are scheduled against absolute deadlines on the event loop clock, so
+a late tick does not push later ones back. With --stats the server prints
+how late ticks started, how long they took and how many bytes each client
+was sent.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from collections import deque
+from arena import Arena
+from profiler import percentiles
+from protocol import encode_delta, encode_snapshot, encode_welcome, frame
+from replay import DIRECTION_NAMES
+from world import World, parse_board
+
+MAX_BUFFERED = 1 << 20
+MAX_BEHIND = 5
+
+class Client:
+    def __init__(self, snake_id, writer):
+        self.snake_id = snake_id
+        self.writer = writer
+
+class GameServer:
+    def __init__(self, world, tick_ms=100):
+        self.world = world
+        self.tick_ms = tick_ms
+        self.clients = {}
+        self.joining = []
+        self.lateness = deque(maxlen=600)
+        self.tick_times = deque(maxlen=600)
+        self.frame_sizes = deque(maxlen=600)
+    
+    async def handle(self, reader, writer):
+        snake = self.world.add_snake()
+        client = Client(snake.id, writer)
+        self.joining.append(client)
+        try:
+            while True:
+                data = await reader.read(256)
+                if not data:
+                    break
+                for code in data:
+                    if code < len(DIRECTION_NAMES):
+                        self.world.turn(snake.id, DIRECTION_NAMES[code])
+        except ConnectionError:
+            pass
+        finally:
+            self.drop(client)
+    
+    def drop(self, client):
+        if client in self.joining:
+            self.joining.remove(client)
+        self.clients.pop(client.snake_id, None)
+        self.world.remove_snake(client.snake_id)
+        client.writer.close()
+    
+    def send(self, client, data):
+        writer = client.writer
+        if writer.is_closing():
+            return
+        if writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+            print(f"Error sending to player {client.snake_id}: too far behind, disconnecting")
+            writer.close()
+            return
+        writer.write(data)
+    
+    def tick(self):
+        delta = self.world.step()
+        data = frame(encode_delta(delta))
+        self.frame_sizes.append(len(data))
+        for client in list(self.clients.values()):
+            self.send(client, data)
+        
+        # New players get the board as it is after this tick; the next delta follows on from it.
+        if self.joining:
+            snapshot = frame(encode_snapshot(self.world))
+            for client in self.joining:
+                welcome = frame(encode_welcome(client.snake_id, self.world.cols, self.world.rows, self.tick_ms))
+                self.send(client, welcome + snapshot)
+                self.clients[client.snake_id] = client
+            self.joining.clear()
+    
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        interval = self.tick_ms / 1000
+        deadline = loop.time()
+        while True:
+            deadline += interval
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif -delay > MAX_BEHIND * interval:
+                deadline = loop.time()
+            self.lateness.append((loop.time() - deadline) * 1000)
+            start = time.perf_counter()
+            self.tick()
+            self.tick_times.append((time.perf_counter() - start) * 1000)
+    
+    def stats_text(self):
+        late = percentiles(self.lateness, (50, 99)) or [0.0, 0.0]
+        cost = percentiles(self.tick_times, (50, 99)) or [0.0, 0.0]
+        frame_bytes = sum(self.frame_sizes) / len(self.frame_sizes) if self.frame_sizes else 0
+        per_second = frame_bytes * 1000 / self.tick_ms
+        return (
+            f"tick {self.world.tick} players {len(self.clients)} "
+            f"late ms p50 {late[0]:5.2f} p99 {late[1]:5.2f} "
+            f"tick ms p50 {cost[0]:5.2f} p99 {cost[1]:5.2f} "
+            f"frame {frame_bytes:6.0f} B ({per_second / 1024:6.1f} KiB/s per client)"
+        )
+    
+    async def report(self, every):
+        while True:
+            await asyncio.sleep(every)
+            print(self.stats_text())
+
+async def serve(host, port, world, tick_ms, stats=0):
+    server = GameServer(world, tick_ms)
+    listener = await asyncio.start_server(server.handle, host, port)
+    print(f"Serving a {world.cols}x{world.rows} board on {host}:{port}, one tick every {tick_ms} ms")
+    tasks = [asyncio.ensure_future(server.run())]
+    if stats:
+        tasks.append(asyncio.ensure_future(server.report(stats)))
+    async with listener:
+        await asyncio.gather(*tasks)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host a shared Snake board")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5555)
+    parser.add_argument("--board", type=parse_board, default=(64, 64), help="COLSxROWS")
+    parser.add_argument("--tick-ms", type=int, default=100)
+    parser.add_argument("--food", type=int, default=16, help="food on the board at once")
+    parser.add_argument("--bots", type=int, default=0, help="AI snakes sharing the board with the players")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--stats", type=float, default=0, help="print tick statistics every N seconds")
+    args = parser.parse_args(argv)
+    
+    if args.bots:
+        world = Arena(*args.board, bots=args.bots, food_count=max(args.food, args.bots), seed=args.seed)
+    else:
+        world = World(*args.board, food_count=args.food, seed=args.seed)
+    try:
+        asyncio.run(serve(args.host, args.port, world, args.tick_ms, args.stats))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
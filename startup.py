@@ -0,0 +1,18 @@
+"""Startup timing.
+
+Imported first by homescreen.py, so STARTED_AT is as close to process start
+as the game can observe. mark() records milliseconds since then (or since
+another perf_counter() value) and prints them when SNAKE_PROFILE is set.
+"""
+import os
+import time
+
+STARTED_AT = time.perf_counter()
+
+marks = {}
+
+def mark(name, since=STARTED_AT):
+    marks[name] = (time.perf_counter() - since) * 1000
+    if os.environ.get("SNAKE_PROFILE"):
+        print(f"startup: {name} {marks[name]:.1f} ms")
+    return marks[name]
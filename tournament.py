@@ -0,0 +1,259 @@
+"""Play many seeded games per strategy on every core and report the results.
+
+    python tournament.py                                    # all built-in strategies, 1000 games each
+    python tournament.py -s greedy -s hamiltonian -n 100000 --results games.csv
+    python tournament.py -s mybot:choose                     # any importable function
+
+A strategy is a function ``choose(engine, rng)`` that returns a direction name
+(or None to keep going straight) before every tick. Each game runs a
+SnakeEngine seeded with its game number, so a game is reproducible from its
+strategy and seed alone; ``rng`` is a separate per-game generator the
+strategy may use without disturbing food placement. Games are played in
+chunks on a process pool and results are streamed back to the aggregator
+as each chunk finishes.
+"""
+import argparse
+import autopilot
+import csv
+import importlib
+import multiprocessing
+import os
+import random
+import sys
+import time
+from engine import DIRECTIONS, OPPOSITE_DIRECTIONS, SnakeEngine
+from grid import cycle_for
+from profiler import percentile
+
+CHUNK_SIZE = 50
+MAX_TICKS = 20000
+PERCENTILES = (50, 90, 99)
+# (board size in pixels, cell size): cycles in both orientations and a range of sizes.
+CHECK_BOARDS = ((600, 25), (600, 20), (600, 30), (600, 50), (400, 20), (500, 25))
+
+def safe_directions(engine):
+    """Directions that do not run into a wall or the snake on the next tick."""
+    counts = engine.grid.counts
+    options = []
+    for direction in DIRECTIONS:
+        if direction == OPPOSITE_DIRECTIONS[engine.direction]:
+            continue
+        cell = engine.next_cell(direction)
+        if cell is not None and not counts[cell]:
+            options.append(direction)
+    return options
+
+def straight(engine, rng):
+    return None
+
+def random_safe(engine, rng):
+    options = safe_directions(engine)
+    return rng.choice(options) if options else None
+
+def greedy(engine, rng):
+    """Head for the golden apple, or else the food, along the shortest safe step."""
+    options = safe_directions(engine)
+    if not options:
+        return None
+    target = engine.golden_apple_cell if engine.golden_apple_cell is not None else engine.food_cell
+    if target is None:
+        return options[0]
+    cols = engine.cols
+    target_row, target_col = divmod(target, cols)
+    
+    def distance(direction):
+        row, col = divmod(engine.next_cell(direction), cols)
+        return abs(row - target_row) + abs(col - target_col)
+    
+    return min(options, key=distance)
+
+def hamiltonian(engine, rng):
+    """Follow a fixed Hamiltonian cycle; slow to reach food, but never dies on a board that has one.
+    
+    The snake starts wherever the engine puts it, possibly facing against the
+    cycle. Until the neck is the head's predecessor on the cycle (or, for a
+    one-cell snake, until the cycle step is not a reversal) it plays greedy.
+    """
+    directions = cycle_for(engine.cols, engine.rows)
+    if directions is None:
+        return greedy(engine, rng)
+    body = engine.body
+    direction = directions[body.head()]
+    if len(body) == 1:
+        on_cycle = direction != OPPOSITE_DIRECTIONS[engine.direction]
+    else:
+        # The last move went from the neck to the head in engine.direction.
+        on_cycle = directions[body[1]] == engine.direction
+    return direction if on_cycle else greedy(engine, rng)
+
+STRATEGIES = {
+    "straight": straight,
+    "random": random_safe,
+    "greedy": greedy,
+    "hamiltonian": hamiltonian,
+    "autopilot": autopilot.choose
+}
+
+def resolve_strategy(name):
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    module_name, _, function_name = name.partition(":")
+    if not function_name:
+        raise ValueError(f"unknown strategy {name!r}; use one of {', '.join(STRATEGIES)} or module:function")
+    return getattr(importlib.import_module(module_name), function_name)
+
+def play_game(choose, seed, board_width, board_height, unit_size, max_ticks=MAX_TICKS):
+    """Play one game to death or ``max_ticks``; returns (score, length, ticks, died)."""
+    engine = SnakeEngine(board_width, board_height, unit_size, seed=seed)
+    rng = random.Random(-seed - 1)
+    step = engine.step
+    while engine.alive and engine.ticks < max_ticks:
+        step(choose(engine, rng))
+    return engine.score, len(engine.body), engine.ticks, not engine.alive
+
+def play_chunk(task):
+    name, seeds, board_width, board_height, unit_size, max_ticks = task
+    choose = resolve_strategy(name)
+    return name, [
+        (seed,) + play_game(choose, seed, board_width, board_height, unit_size, max_ticks)
+        for seed in seeds
+    ]
+
+def make_tasks(strategies, games, first_seed, board_width, board_height, unit_size, max_ticks, chunk_size=CHUNK_SIZE):
+    for start in range(first_seed, first_seed + games, chunk_size):
+        seeds = range(start, min(start + chunk_size, first_seed + games))
+        for name in strategies:
+            yield name, seeds, board_width, board_height, unit_size, max_ticks
+
+def check_hamiltonian(boards=CHECK_BOARDS, seeds=range(10), max_ticks=MAX_TICKS):
+    """Play ``hamiltonian`` on every board; returns the games where it died before filling the board."""
+    failures = []
+    for board, unit in boards:
+        cells = (board // unit) ** 2
+        for seed in seeds:
+            score, length, ticks, died = play_game(hamiltonian, seed, board, board, unit, max_ticks)
+            if died and length < cells - 1:
+                failures.append((board, unit, seed, ticks, length))
+    return failures
+
+class Aggregator:
+    FIELDS = ("score", "length", "ticks")
+    
+    def __init__(self, strategies):
+        self.results = {name: {field: [] for field in self.FIELDS} for name in strategies}
+        self.timeouts = dict.fromkeys(strategies, 0)
+        self.games = 0
+    
+    def add(self, name, rows):
+        columns = self.results[name]
+        for _, score, length, ticks, died in rows:
+            columns["score"].append(score)
+            columns["length"].append(length)
+            columns["ticks"].append(ticks)
+            if not died:
+                self.timeouts[name] += 1
+        self.games += len(rows)
+    
+    def summary(self):
+        """Return {strategy: {field: {"mean": ..., "p50": ..., ...}}}."""
+        summary = {}
+        for name, columns in self.results.items():
+            summary[name] = {}
+            for field, values in columns.items():
+                if not values:
+                    continue
+                values = sorted(values)
+                stats = {"mean": sum(values) / len(values)}
+                for p in PERCENTILES:
+                    stats[f"p{p}"] = percentile(values, p)
+                stats["max"] = values[-1]
+                summary[name][field] = stats
+        return summary
+    
+    def report(self):
+        header = f"{'strategy':<20}{'field':<8}{'mean':>10}" + "".join(f"{f'p{p}':>8}" for p in PERCENTILES) + f"{'max':>8}"
+        lines = [header]
+        for name, fields in self.summary().items():
+            games = len(self.results[name]["score"])
+            for field, stats in fields.items():
+                label = f"{name} ({games})" if field == "score" else ""
+                lines.append(
+                    f"{label:<20}{field:<8}{stats['mean']:>10.1f}"
+                    + "".join(f"{stats[f'p{p}']:>8}" for p in PERCENTILES)
+                    + f"{stats['max']:>8}"
+                )
+            if self.timeouts[name]:
+                lines.append(f"{'':<20}{self.timeouts[name]} game(s) hit the tick limit")
+        return "\n".join(lines)
+
+def run_tournament(strategies, games, first_seed=0, board_width=600, board_height=600, unit_size=25,
+                   max_ticks=MAX_TICKS, processes=None, on_chunk=None):
+    for name in strategies:
+        resolve_strategy(name)
+    aggregator = Aggregator(strategies)
+    tasks = make_tasks(strategies, games, first_seed, board_width, board_height, unit_size, max_ticks)
+    with multiprocessing.Pool(processes) as pool:
+        for name, rows in pool.imap_unordered(play_chunk, tasks):
+            aggregator.add(name, rows)
+            if on_chunk is not None:
+                on_chunk(name, rows)
+    return aggregator
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Snake Game strategy tournament")
+    parser.add_argument("-s", "--strategy", action="append", dest="strategies",
+                        help="built-in strategy or module:function (repeatable; default: all built-ins)")
+    parser.add_argument("-n", "--games", type=int, default=1000, help="games per strategy")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--board", default="600x600", help="board size in pixels, WIDTHxHEIGHT")
+    parser.add_argument("--unit", type=int, default=25, help="cell size in pixels")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS, help="end games that survive this long")
+    parser.add_argument("-j", "--processes", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--results", metavar="CSV", help="write one row per game")
+    parser.add_argument("--check", action="store_true", help="check that hamiltonian fills boards of several sizes")
+    args = parser.parse_args(argv)
+    
+    if args.check:
+        failures = check_hamiltonian()
+        for board, unit, seed, ticks, length in failures:
+            print(f"hamiltonian {board}x{board}/{unit} seed {seed}: died at tick {ticks} with length {length}")
+        print(f"hamiltonian: {len(CHECK_BOARDS)} board sizes, {len(failures)} failure(s)")
+        return 1 if failures else 0
+    
+    strategies = args.strategies or list(STRATEGIES)
+    board_width, board_height = (int(value) for value in args.board.lower().split("x"))
+    total = args.games * len(strategies)
+    
+    results_file = writer = None
+    if args.results:
+        results_file = open(args.results, "w", newline="")
+        writer = csv.writer(results_file)
+        writer.writerow(("strategy", "seed", "score", "length", "ticks", "died"))
+    
+    started = time.perf_counter()
+    done = 0
+    
+    def on_chunk(name, rows):
+        nonlocal done
+        done += len(rows)
+        if writer is not None:
+            writer.writerows((name,) + row for row in rows)
+        elapsed = time.perf_counter() - started
+        print(f"\r{done}/{total} games, {done / elapsed:.0f} games/s", end="", file=sys.stderr, flush=True)
+    
+    try:
+        aggregator = run_tournament(
+            strategies, args.games, args.seed, board_width, board_height, args.unit,
+            args.max_ticks, args.processes, on_chunk
+        )
+    finally:
+        if results_file is not None:
+            results_file.close()
+    
+    print(file=sys.stderr)
+    print(aggregator.report())
+    print(f"{aggregator.games} games in {time.perf_counter() - started:.1f}s on {args.processes} process(es)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
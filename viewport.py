@@ -0,0 +1,288 @@
+"""Large-board rendering through a camera.
+
+ViewportRenderer draws a window of the world onto a fixed-size canvas. The
+camera keeps the snake's head inside the window, moving only when the head
+comes within ``margin`` cells of an edge. Each frame only the cells under
+the window are looked at: the occupancy grid is scanned row by row over the
+visible columns, the grass is a handful of chunk images that all share one
+photo, and food, particles and segments outside the window are not drawn.
+Canvas items are keyed by cell and recycled as cells scroll out of view, so
+item count and frame time depend on the viewport size, not the world size.
+
+Segment colors depend on the distance from the head, which the grid does not
+know, so the renderer keeps the sequence number each body cell was entered
+with; a segment's index is ``head_seq - seq``. Entries for cells the snake
+has left are dropped whenever the map grows to twice the snake's length.
+"""
+from palette import FADED_INDEX, body_palette, rainbow_color
+from renderer import BODY_OUTLINE, HEAD_OUTLINE, MAX_PARTICLE_ITEMS, CanvasRenderer
+
+class Camera:
+    def __init__(self, world_cols, world_rows, view_cols, view_rows, margin=4):
+        self.world_cols = world_cols
+        self.world_rows = world_rows
+        self.view_cols = min(view_cols, world_cols)
+        self.view_rows = min(view_rows, world_rows)
+        self.margin = min(margin, (self.view_cols - 1) // 2, (self.view_rows - 1) // 2)
+        self.col = 0
+        self.row = 0
+    
+    def clamp(self):
+        self.col = max(0, min(self.col, self.world_cols - self.view_cols))
+        self.row = max(0, min(self.row, self.world_rows - self.view_rows))
+    
+    def center_on(self, col, row):
+        self.col = col - self.view_cols // 2
+        self.row = row - self.view_rows // 2
+        self.clamp()
+    
+    def follow(self, col, row):
+        """Scroll just enough to keep (col, row) ``margin`` cells inside the view."""
+        margin = self.margin
+        if col < self.col + margin:
+            self.col = col - margin
+        elif col > self.col + self.view_cols - 1 - margin:
+            self.col = col - self.view_cols + 1 + margin
+        if row < self.row + margin:
+            self.row = row - margin
+        elif row > self.row + self.view_rows - 1 - margin:
+            self.row = row - self.view_rows + 1 + margin
+        self.clamp()
+    
+    def contains(self, col, row):
+        return self.col <= col < self.col + self.view_cols and self.row <= row < self.row + self.view_rows
+
+class ViewportRenderer(CanvasRenderer):
+    def __init__(self, canvas, engine, view_width, view_height, grass_photo=None, apple_photo=None,
+                 golden_apple_photo=None, chunk_cells=8, margin=4):
+        unit = engine.unit_size
+        self.camera = Camera(engine.cols, engine.rows, view_width // unit, view_height // unit, margin)
+        self.chunk_cells = chunk_cells
+        super().__init__(canvas, engine, grass_photo, apple_photo, golden_apple_photo)
+    
+    def reset(self):
+        self.canvas.delete("all")
+        
+        self.drawn = {}
+        self.spare_segments = []
+        self.seq = {}
+        self.head_seq = 0
+        self.synced_ticks = None
+        self.scale_rainbow = None
+        
+        self.particle_items = []
+        self.particle_colors = []
+        self.visible_particles = 0
+        
+        self.chunk_items = []
+        self.followed_head = None
+        self.origin = None
+        self.drawn_origin = None
+        self.food_key = None
+        self.golden_apple_key = None
+        
+        self.create_food_items()
+        self.create_golden_apple_items()
+        self.eyes = (
+            self.canvas.create_oval(0, 0, 0, 0, fill="black", tags="eyes"),
+            self.canvas.create_oval(0, 0, 0, 0, fill="black", tags="eyes")
+        )
+        
+        head_row, head_col = divmod(self.engine.body.head(), self.engine.cols)
+        self.camera.center_on(head_col, head_row)
+        self.render()
+    
+    def follow(self):
+        """Move the camera with the head and redraw the grass when it scrolls."""
+        head = self.engine.body.head()
+        if head == self.followed_head:
+            return
+        self.followed_head = head
+        row, col = divmod(head, self.engine.cols)
+        camera = self.camera
+        camera.follow(col, row)
+        if (camera.col, camera.row) != self.origin:
+            self.origin = (camera.col, camera.row)
+            self.draw_grass()
+    
+    def screen_position(self, cell):
+        """Canvas position of a world cell, or None when it is outside the view."""
+        row, col = divmod(cell, self.engine.cols)
+        if not self.camera.contains(col, row):
+            return None
+        return (col - self.camera.col) * self.unit_size, (row - self.camera.row) * self.unit_size
+    
+    def draw_grass(self):
+        if self.background_photo is None:
+            return
+        camera = self.camera
+        chunk = self.chunk_cells
+        chunk_size = chunk * self.unit_size
+        first_col = camera.col // chunk
+        first_row = camera.row // chunk
+        last_col = (camera.col + camera.view_cols - 1) // chunk
+        last_row = (camera.row + camera.view_rows - 1) // chunk
+        
+        count = 0
+        for chunk_row in range(first_row, last_row + 1):
+            for chunk_col in range(first_col, last_col + 1):
+                x = chunk_col * chunk_size - camera.col * self.unit_size
+                y = chunk_row * chunk_size - camera.row * self.unit_size
+                if count == len(self.chunk_items):
+                    item = self.canvas.create_image(x, y, image=self.background_photo, anchor="nw", tags="grass")
+                    self.canvas.tag_lower(item)
+                    self.chunk_items.append(item)
+                else:
+                    self.canvas.coords(self.chunk_items[count], x, y)
+                count += 1
+        for item in self.chunk_items[count:]:
+            self.canvas.delete(item)
+        del self.chunk_items[count:]
+    
+    def draw_particles(self, particles):
+        self.follow()
+        super().draw_particles(particles)
+    
+    def particle_boxes(self, particles):
+        camera = self.camera
+        unit = self.unit_size
+        left = camera.col * unit
+        top = camera.row * unit
+        right = left + camera.view_cols * unit
+        bottom = top + camera.view_rows * unit
+        for x0, y0, x1, y1, color in particles.boxes(MAX_PARTICLE_ITEMS):
+            if x1 >= left and x0 <= right and y1 >= top and y0 <= bottom:
+                yield x0 - left, y0 - top, x1 - left, y1 - top, color
+    
+    def draw_food(self):
+        self.follow()
+        cell = self.engine.food_cell
+        key = (cell, self.origin)
+        if key == self.food_key:
+            return
+        self.food_key = key
+        self.show_food(None if cell is None else self.screen_position(cell))
+    
+    def draw_golden_apple(self):
+        self.follow()
+        cell = self.engine.golden_apple_cell
+        key = (cell, self.origin)
+        if key == self.golden_apple_key:
+            return
+        self.golden_apple_key = key
+        self.show_golden_apple(None if cell is None else self.screen_position(cell))
+    
+    def sync_sequence(self):
+        engine = self.engine
+        body = engine.body
+        new_heads = -1 if self.synced_ticks is None else engine.ticks - self.synced_ticks
+        self.synced_ticks = engine.ticks
+        
+        seq = self.seq
+        if new_heads < 0 or new_heads > len(body) or len(seq) > 2 * len(body) + 64:
+            self.head_seq += len(body)
+            seq.clear()
+            for index in range(len(body) - 1, -1, -1):
+                seq[body[index]] = self.head_seq - index
+            return
+        for index in range(new_heads - 1, -1, -1):
+            self.head_seq += 1
+            seq[body[index]] = self.head_seq
+    
+    def draw_snake(self):
+        self.follow()
+        self.sync_sequence()
+        
+        engine = self.engine
+        canvas = self.canvas
+        camera = self.camera
+        counts = engine.grid.counts
+        cols = engine.cols
+        size = self.unit_size
+        seq = self.seq
+        head_seq = self.head_seq
+        moved = self.origin != self.drawn_origin
+        self.drawn_origin = self.origin
+        
+        rainbow = engine.rainbow_effect
+        phase = engine.rainbow_timer
+        palette = body_palette(engine.snake_color)
+        if rainbow != self.scale_rainbow:
+            canvas.itemconfig("scale", fill=self.scale_color())
+            self.scale_rainbow = rainbow
+        
+        previous = self.drawn
+        drawn = {}
+        empty_row = bytes(camera.view_cols)
+        for view_row in range(camera.view_rows):
+            base = (camera.row + view_row) * cols + camera.col
+            row_counts = counts[base:base + camera.view_cols]
+            if row_counts == empty_row:
+                continue
+            y = view_row * size
+            for view_col, count in enumerate(row_counts):
+                if not count:
+                    continue
+                cell = base + view_col
+                index = head_seq - seq[cell]
+                x = view_col * size
+                
+                segment = previous.pop(cell, None)
+                if segment is None:
+                    segment = self.take_segment()
+                    placed = True
+                else:
+                    placed = moved
+                
+                head = index == 0
+                if placed or segment[2] != head:
+                    inset = 2 if head else 1
+                    canvas.coords(segment[0], x + inset, y + inset, x + size - inset, y + size - inset)
+                    if segment[2] != head:
+                        canvas.itemconfig(
+                            segment[0], outline=HEAD_OUTLINE if head else BODY_OUTLINE, width=2 if head else 1
+                        )
+                        segment[2] = head
+                if placed:
+                    canvas.coords(segment[1], x + 5, y + size // 2, x + size - 5, y + size // 2)
+                
+                color = rainbow_color(phase + index * 10) if rainbow else palette[min(index, FADED_INDEX)]
+                if segment[3] != color:
+                    canvas.itemconfig(segment[0], fill=color)
+                    segment[3] = color
+                stripe = index > 0 and index % 2 == 0
+                if segment[4] != stripe:
+                    canvas.itemconfig(segment[1], state="normal" if stripe else "hidden")
+                    segment[4] = stripe
+                drawn[cell] = segment
+        
+        for segment in previous.values():
+            canvas.itemconfig(segment[0], state="hidden")
+            canvas.itemconfig(segment[1], state="hidden")
+            self.spare_segments.append(segment)
+        self.drawn = drawn
+        
+        self.draw_eyes()
+    
+    def take_segment(self):
+        """A hidden [rect, line, is_head, fill, stripe] item pair ready to be placed."""
+        if self.spare_segments:
+            segment = self.spare_segments.pop()
+            self.canvas.itemconfig(segment[0], state="normal")
+            segment[4] = False
+            return segment
+        rect = self.canvas.create_rectangle(0, 0, 0, 0, outline=BODY_OUTLINE, width=1, tags="snake")
+        line = self.canvas.create_line(0, 0, 0, 0, width=1, fill=self.scale_color(), state="hidden", tags="scale")
+        self.canvas.tag_raise("eyes")
+        return [rect, line, False, None, False]
+    
+    def draw_eyes(self):
+        position = self.screen_position(self.engine.body.head())
+        if position is None:
+            self.canvas.itemconfig("eyes", state="hidden")
+            return
+        x, y = position
+        size = self.eye_size
+        for eye, (eye_dx, eye_dy) in zip(self.eyes, self.eye_offsets[self.engine.direction]):
+            self.canvas.coords(eye, x + eye_dx, y + eye_dy, x + eye_dx + size, y + eye_dy + size)
+        self.canvas.itemconfig("eyes", state="normal")
\ No newline at end of file
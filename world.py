@@ -0,0 +1,228 @@
+"""Shared-board rules for several snakes.
+
+World is the multiplayer counterpart of SnakeEngine: any number of snakes
+move on one board, and every snake's cells are counted in a single
+OccupancyGrid, so a collision check is one lookup no matter how many snakes
+there are. All snakes move at once each tick. As in SnakeEngine, a head
+that enters an occupied cell dies before any tail moves away. When several
+heads enter the same cell, resolve_head_on() picks the survivor, if any; by
+default they all die. A snake that dies gives its cells back, and it
+respawns on a random free cell after ``respawn_ticks`` ticks.
+
+A second grid, ``taken``, counts food as well as snakes, so a cell for new
+food or a new snake is drawn from the cells that are truly empty. That stays
+a single random pick however crowded the board gets.
+
+Everything a tick changes is collected in a Delta, which is what the
+server broadcasts to clients.
+"""
+import random
+from controls import InputQueue
+from engine import DIRECTIONS
+from grid import OccupancyGrid, SnakeBody
+from replay import DIRECTION_CODES, DIRECTION_NAMES
+
+FOOD_SCORE = 10
+
+def parse_board(text):
+    """``COLSxROWS`` from the command line."""
+    cols, rows = (int(value) for value in text.lower().split("x"))
+    return cols, rows
+
+class Delta:
+    """Changes of one tick, applied in this order: left, spawned, moves, died, food.
+
+    Players leave and join between ticks, so their cells are freed and taken
+    before any snake moves.
+    """
+    
+    __slots__ = ("tick", "left", "spawned", "moves", "died", "food_removed", "food_added")
+    
+    def __init__(self, tick=0):
+        self.tick = tick
+        self.left = []
+        self.spawned = []       # (snake id, direction code, cells head first)
+        self.moves = []         # (snake id, direction code, grew)
+        self.died = []
+        self.food_removed = []
+        self.food_added = []
+
+class Snake:
+    def __init__(self, snake_id, max_length):
+        self.id = snake_id
+        self.body = SnakeBody(max_length, 16)
+        self.direction = "right"
+        self.inputs = InputQueue()
+        self.alive = False
+        self.score = 0
+        self.respawn_at = 0
+
+class World:
+    def __init__(self, cols=64, rows=64, food_count=8, respawn_ticks=20, seed=None):
+        self.cols = cols
+        self.rows = rows
+        self.grid = OccupancyGrid(cols, rows)
+        self.taken = OccupancyGrid(cols, rows)
+        self.rng = random.Random(seed)
+        self.food_count = food_count
+        self.respawn_ticks = respawn_ticks
+        self.snakes = {}
+        self.food = set()
+        self.tick = 0
+        self.next_id = 1
+        self.changes = Delta()
+        self.add_food(self.changes)
+    
+    def add_snake(self):
+        snake = Snake(self.next_id, self.grid.size + 1)
+        self.next_id += 1
+        self.snakes[snake.id] = snake
+        self.spawn(snake, self.changes)
+        return snake
+    
+    def remove_snake(self, snake_id):
+        snake = self.snakes.pop(snake_id, None)
+        if snake is None:
+            return
+        if snake.alive:
+            self.clear_body(snake)
+        spawned = self.changes.spawned
+        pending = [entry for entry in spawned if entry[0] != snake_id]
+        if len(pending) < len(spawned):
+            # Clients have not seen this life of the snake yet; just take the spawn back.
+            spawned[:] = pending
+        else:
+            self.changes.left.append(snake_id)
+    
+    def turn(self, snake_id, direction):
+        """Queue a turn for the snake; it is applied on a later tick, one per tick."""
+        snake = self.snakes.get(snake_id)
+        if snake is None or not snake.alive:
+            return False
+        return snake.inputs.push(direction, snake.direction)
+    
+    def next_cell(self, snake):
+        dx, dy = DIRECTIONS[snake.direction]
+        row, col = divmod(snake.body.head(), self.cols)
+        col += dx
+        row += dy
+        if col < 0 or col >= self.cols or row < 0 or row >= self.rows:
+            return None
+        return row * self.cols + col
+    
+    def random_free_cell(self):
+        """A cell with no snake and no food on it, or None when there is none."""
+        return self.taken.random_free(self.rng)
+    
+    def spawn(self, snake, delta):
+        cell = self.random_free_cell()
+        if cell is None:
+            snake.respawn_at = self.tick + 1
+            return False
+        snake.body.clear()
+        snake.body.push_head(cell)
+        self.grid.add(cell)
+        self.taken.add(cell)
+        snake.alive = True
+        snake.score = 0
+        snake.inputs.clear()
+        
+        # Face a free neighbor when there is one, so a new snake is not spawned to die.
+        counts = self.grid.counts
+        directions = list(DIRECTION_NAMES)
+        self.rng.shuffle(directions)
+        snake.direction = directions[0]
+        for direction in directions:
+            snake.direction = direction
+            following = self.next_cell(snake)
+            if following is not None and not counts[following]:
+                break
+        delta.spawned.append((snake.id, DIRECTION_CODES[snake.direction], (cell,)))
+        return True
+    
+    def clear_body(self, snake):
+        for cell in snake.body:
+            self.grid.remove(cell)
+            self.taken.remove(cell)
+        snake.body.clear()
+        snake.alive = False
+    
+    def add_food(self, delta):
+        while len(self.food) < self.food_count:
+            cell = self.random_free_cell()
+            if cell is None:
+                return
+            self.place_food(cell, delta)
+    
+    def place_food(self, cell, delta):
+        self.food.add(cell)
+        self.taken.add(cell)
+        delta.food_added.append(cell)
+    
+    def eat_food(self, snake, cell, delta):
+        # The cell stays taken: the snake's head replaces the food on it.
+        self.food.remove(cell)
+        delta.food_removed.append(cell)
+        snake.score += FOOD_SCORE
+    
+    def resolve_head_on(self, movers):
+        """The snake that survives when ``movers`` enter the same cell, or None."""
+        return None
+    
+    def step(self):
+        """Advance every snake one tick and return the Delta to broadcast."""
+        self.tick += 1
+        delta = self.changes
+        delta.tick = self.tick
+        self.changes = Delta()
+        
+        for snake in self.snakes.values():
+            if not snake.alive and snake.respawn_at <= self.tick:
+                self.spawn(snake, delta)
+        
+        counts = self.grid.counts
+        dead = []
+        targets = {}
+        for snake in self.snakes.values():
+            if not snake.alive:
+                continue
+            direction = snake.inputs.pop(snake.direction)
+            if direction is not None:
+                snake.direction = direction
+            cell = self.next_cell(snake)
+            if cell is None or counts[cell]:
+                dead.append(snake)
+            elif cell in targets:
+                targets[cell].append(snake)
+            else:
+                targets[cell] = [snake]
+        
+        grid = self.grid
+        taken = self.taken
+        food = self.food
+        for cell, movers in targets.items():
+            snake = movers[0]
+            if len(movers) > 1:
+                snake = self.resolve_head_on(movers)
+                dead.extend(mover for mover in movers if mover is not snake)
+                if snake is None:
+                    continue
+            snake.body.push_head(cell)
+            grid.add(cell)
+            grew = cell in food
+            if grew:
+                self.eat_food(snake, cell, delta)
+            else:
+                taken.add(cell)
+                tail = snake.body.pop_tail()
+                grid.remove(tail)
+                taken.remove(tail)
+            delta.moves.append((snake.id, DIRECTION_CODES[snake.direction], grew))
+        
+        for snake in dead:
+            self.clear_body(snake)
+            snake.respawn_at = self.tick + self.respawn_ticks
+            delta.died.append(snake.id)
+        
+        self.add_food(delta)
+        return delta
\ No newline at end of file